@@ -0,0 +1,180 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import string
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from modules.corpus import CorpusArchive, ReplayFetcher
+from modules.scraper import Scraper, StreamingPageParser, TextProcessor, Topic
+from modules.translator_server import fake_translation
+from modules.analysis.common_functions import TranslationDataset
+from modules.analysis.distance_table import DistanceTable
+from modules.analysis.global_proximity import GlobalProximityAnalyzer
+from modules.analysis.topic_analysis import TopicAnalyzer
+from modules.analysis.word_distance import WordDistanceAnalyzer
+from modules.analysis.community_detection import CommunityDetector
+from modules.analysis.outlier_detection import OutlierDetector
+from benchmarks.scrape_benchmark import NullStorage
+
+LANGUAGES = ["en", "es", "fr", "pl", "de", "it", "pt", "nl", "sv", "cs", "ro", "hu"]
+
+def synthetic_word(rng: random.Random, mean_length: float, length_spread: float) -> str:
+    length = max(1, round(rng.gauss(mean_length, length_spread)))
+    return "".join(rng.choice(string.ascii_lowercase) for _ in range(length))
+
+def synthetic_translations(topic_count: int, words_per_topic: int, language_count: int,
+                           mean_length: float = 7.0, length_spread: float = 2.5,
+                           overlap: float = 0.1, seed: int = 0) -> list:
+    """translated.json-shaped data; `overlap` is the share of each topic's words
+    borrowed from the previous topic, so words repeat across topics like real data."""
+    if not 2 <= language_count <= len(LANGUAGES):
+        raise ValueError(f"language_count must be between 2 and {len(LANGUAGES)}")
+    rng = random.Random(seed)
+    targets = LANGUAGES[1:language_count]
+
+    topics = []
+    previous = []
+    for t in range(topic_count):
+        shared = previous[:int(words_per_topic * overlap)]
+        words = shared + [synthetic_word(rng, mean_length, length_spread)
+                          for _ in range(words_per_topic - len(shared))]
+        topics.append({
+            "topic": f"Topic {t}",
+            "words": [{"en": word, **{lang: fake_translation(word, lang) for lang in targets}} for word in words]
+        })
+        previous = words
+    return topics
+
+def synthetic_corpus(archive_path: str, topic_count: int, words_per_page: int, seed: int = 0) -> list[Topic]:
+    """Archive of glossary-like pages for an offline scrape, in the markup StreamingPageParser reads."""
+    rng = random.Random(seed)
+    archive = CorpusArchive(archive_path)
+    topics = []
+    for t in range(topic_count):
+        url = f"https://example.org/wiki/Glossary_{t}"
+        terms = "\n".join(
+            f'<li><span class="term"><a href="/wiki/{word}">{word}</a></span> - {synthetic_word(rng, 6, 2)}</li>'
+            for word in (synthetic_word(rng, 7, 2.5) for _ in range(words_per_page))
+        )
+        archive.add(url, f"<html><body><h1>Glossary {t}</h1><ul>\n{terms}\n</ul></body></html>")
+        topics.append(Topic(url=url, title=f"Glossary {t}"))
+    return topics
+
+def analysis_stages(workdir: str, workers: int):
+    data_path = os.path.join(workdir, "translated.json")
+    analysis_dir = os.path.join(workdir, "analysis")
+    paths = {name: os.path.join(analysis_dir, f"{name}.json")
+             for name in ("global_proximity", "topic_proximity", "word_distance", "communities")}
+    shared = {}
+
+    def distance_table():
+        shared["table"] = DistanceTable(TranslationDataset.from_file(data_path), workers=workers)
+
+    return [
+        ("distance_table", distance_table),
+        ("global_proximity", lambda: GlobalProximityAnalyzer(
+            data_path, paths["global_proximity"], distance_table=shared["table"]).run()),
+        ("topic_proximity", lambda: TopicAnalyzer(
+            data_path, paths["topic_proximity"], distance_table=shared["table"]).run()),
+        ("word_distance", lambda: WordDistanceAnalyzer(
+            data_path, paths["word_distance"], distance_table=shared["table"]).run()),
+        ("community_detection", lambda: CommunityDetector(paths["topic_proximity"], paths["communities"]).run()),
+        ("outlier_detection", lambda: OutlierDetector(
+            paths["word_distance"], paths["topic_proximity"], analysis_dir).run()),
+    ]
+
+def measure(action, trace_memory: bool) -> dict:
+    if trace_memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            action()
+        elapsed = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1] if trace_memory else None
+    finally:
+        if trace_memory:
+            tracemalloc.stop()
+    return {"seconds": elapsed, "peak_memory_bytes": peak}
+
+def run_benchmark(workdir: str, translations: list, scrape_topics: list[Topic] = None,
+                  archive_path: str = None, workers: int = 1, trace_memory: bool = True):
+    """Times every stage, then reruns them under tracemalloc for peak memory,
+    so tracing overhead does not distort the timings."""
+    with open(os.path.join(workdir, "translated.json"), "w", encoding="utf-8") as f:
+        json.dump(translations, f, ensure_ascii=False)
+
+    stages = []
+    if scrape_topics:
+        def scrape():
+            Scraper(scrape_topics, fetcher=ReplayFetcher(CorpusArchive(archive_path)), parser=StreamingPageParser(),
+                    processor=TextProcessor(), storage=NullStorage()).run()
+        stages.append(("scrape", scrape))
+    stages += analysis_stages(workdir, workers)
+
+    results = {name: measure(action, trace_memory=False) for name, action in stages}
+    if trace_memory:
+        for name, action in stages:
+            results[name]["peak_memory_bytes"] = measure(action, trace_memory=True)["peak_memory_bytes"]
+
+    report = []
+    for name, _ in stages:
+        seconds, peak = results[name]["seconds"], results[name]["peak_memory_bytes"]
+        report.append({
+            "stage": name,
+            "seconds": round(seconds, 4),
+            "peak_memory_mb": round(peak / 2 ** 20, 2) if peak is not None else None
+        })
+        print(f"{name:<20} {seconds:8.3f}s" + (f"  {peak / 2 ** 20:9.2f} MB peak" if peak is not None else ""))
+    return report
+
+def main():
+    base_path = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
+
+    parser = argparse.ArgumentParser(description="Time every pipeline stage on a synthetic corpus, offline.")
+    parser.add_argument("--topics", type=int, default=50)
+    parser.add_argument("--words", type=int, default=100, help="words per topic")
+    parser.add_argument("--languages", type=int, default=4, help="number of languages, English included")
+    parser.add_argument("--mean-length", type=float, default=7.0, help="mean word length")
+    parser.add_argument("--length-spread", type=float, default=2.5, help="standard deviation of word length")
+    parser.add_argument("--overlap", type=float, default=0.1, help="share of words repeated from the previous topic")
+    parser.add_argument("--scrape-pages", type=int, default=20, help="pages in the fake-scrape fixture, 0 to skip")
+    parser.add_argument("--workers", type=int, default=1, help="DistanceTable workers")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc pass")
+    parser.add_argument("--output", default=None,
+                        help="JSON results file (default: data/benchmarks/pipeline-<timestamp>.json)")
+    args = parser.parse_args()
+
+    translations = synthetic_translations(args.topics, args.words, args.languages, args.mean_length,
+                                          args.length_spread, args.overlap, args.seed)
+
+    with tempfile.TemporaryDirectory() as workdir:
+        archive_path = os.path.join(workdir, "corpus.zip")
+        scrape_topics = synthetic_corpus(archive_path, args.scrape_pages, args.words, args.seed) \
+            if args.scrape_pages else None
+        stages = run_benchmark(workdir, translations, scrape_topics, archive_path,
+                               workers=args.workers, trace_memory=not args.no_memory)
+
+    now = datetime.now()
+    output = args.output or os.path.join(base_path, "data", "benchmarks",
+                                         f"pipeline-{now.strftime('%Y%m%d-%H%M%S')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump({
+            "timestamp": now.isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "parameters": {key: value for key, value in vars(args).items() if key != "output"},
+            "stages": stages
+        }, f, indent=2)
+    print(f"Results saved to {output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+import argparse
+import json
+import os
+import time
+import requests
+from modules.corpus import CorpusArchive, CorpusServer
+from modules.scraper import (Scraper, PageFetcher, StreamingPageParser, TextProcessor,
+                             IStorage, Topic, HostRateLimiter)
+
+class NullStorage(IStorage):
+    def store(self, topic: Topic, words: list[str]) -> None:
+        pass
+
+def run_benchmark(archive_path: str, workers: list[int], latency: float, jitter: float,
+                  error_rate: float, per_host_concurrency: int, repeat: int):
+    archive = CorpusArchive(archive_path)
+    results = []
+
+    with CorpusServer(archive, latency=latency, jitter=jitter, error_rate=error_rate) as server:
+        topics = [Topic(url=server.url_for(url), title=url) for url in archive.urls()]
+        topics = topics * repeat
+
+        for max_workers in workers:
+            fetcher = PageFetcher(
+                pool_size=max_workers,
+                rate_limiter=HostRateLimiter(max_concurrent=per_host_concurrency)
+            )
+            scraper = Scraper(topics, fetcher=fetcher, parser=StreamingPageParser(),
+                              processor=TextProcessor(), storage=NullStorage(), max_workers=max_workers)
+
+            error = None
+            start = time.perf_counter()
+            try:
+                scraper.run()
+            except requests.HTTPError as e:
+                # Scraper.run stops at the first failed page, as it does in the pipeline.
+                error = str(e)
+            elapsed = time.perf_counter() - start
+
+            results.append({
+                "max_workers": max_workers,
+                "topics": len(topics),
+                "seconds": round(elapsed, 4),
+                "topics_per_sec": round(len(topics) / elapsed, 2) if elapsed > 0 and error is None else None,
+                "error": error
+            })
+            if error is None:
+                print(f"workers={max_workers:<3} {len(topics)} topics in {elapsed:.3f}s "
+                      f"({results[-1]['topics_per_sec']} topics/s)")
+            else:
+                print(f"workers={max_workers:<3} failed after {elapsed:.3f}s: {error}")
+
+    return results
+
+def main():
+    base_path = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
+
+    parser = argparse.ArgumentParser(description="Measure Scraper.run throughput against a replayed corpus.")
+    parser.add_argument("--archive", default=os.path.join(base_path, "data", "corpus.zip"))
+    parser.add_argument("--workers", default="1,2,4,8", help="comma separated max_workers values")
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--per-host-concurrency", type=int, default=8)
+    parser.add_argument("--repeat", type=int, default=1, help="replay the corpus this many times per run")
+    parser.add_argument("--output", default=None, help="optional JSON file for the results")
+    args = parser.parse_args()
+
+    results = run_benchmark(
+        args.archive,
+        [int(w) for w in args.workers.split(",")],
+        args.latency, args.jitter, args.error_rate,
+        args.per_host_concurrency, args.repeat
+    )
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+if __name__ == "__main__":
+    main()
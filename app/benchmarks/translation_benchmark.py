@@ -0,0 +1,88 @@
+import argparse
+import contextlib
+import io
+import json
+import time
+from modules.translator import WordTranslator
+from modules.translator_server import TranslatorServer
+
+MODES = ["serial", "batched", "concurrent"]
+
+def synthetic_topics(topic_count: int, words_per_topic: int, overlap: float = 0.2):
+    """Topics of made-up words; `overlap` is the share of each topic's words borrowed from the previous one."""
+    topics = []
+    previous = []
+    for t in range(topic_count):
+        shared = previous[:int(words_per_topic * overlap)]
+        words = shared + [f"word{t}x{i}" for i in range(words_per_topic - len(shared))]
+        topics.append({"topic": f"topic{t}", "words": words})
+        previous = words
+    return topics
+
+def run_benchmark(modes, topics, server: TranslatorServer, settings: dict):
+    unique_words = len({word for topic in topics for word in topic["words"]})
+    results = []
+
+    for mode in modes:
+        translator = WordTranslator(settings={
+            **settings,
+            "mode": mode,
+            "endpoint": server.url,
+            "cache_path": None
+        })
+        server.reset_counters()
+
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            translator.translate_topics(topics)
+        elapsed = time.perf_counter() - start
+
+        results.append({
+            "mode": mode,
+            "unique_words": unique_words,
+            "targets": len(translator.target_languages),
+            "requests": server.requests,
+            "seconds": round(elapsed, 4),
+            "words_per_sec": round(unique_words / elapsed, 2),
+            "requests_per_sec": round(server.requests / elapsed, 2)
+        })
+        print(f"{mode:<11} {elapsed:8.3f}s  {results[-1]['words_per_sec']:>10} words/s  "
+              f"{results[-1]['requests_per_sec']:>8} req/s  ({server.requests} requests)")
+
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure WordTranslator throughput against a local stand-in API.")
+    parser.add_argument("--modes", default=",".join(MODES))
+    parser.add_argument("--topics", type=int, default=5)
+    parser.add_argument("--words", type=int, default=40, help="words per topic")
+    parser.add_argument("--latency", type=float, default=0.02)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--throttle-rate", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--max-texts", type=int, default=1000)
+    parser.add_argument("--max-chars", type=int, default=50000)
+    parser.add_argument("--batch-texts", type=int, default=100, help="max_batch_texts used by the translator")
+    parser.add_argument("--in-flight", type=int, default=4, help="max_in_flight for concurrent mode")
+    parser.add_argument("--chars-per-minute", type=int, default=10_000_000)
+    parser.add_argument("--output", default=None, help="optional JSON file for the results")
+    args = parser.parse_args()
+
+    topics = synthetic_topics(args.topics, args.words)
+    settings = {
+        "max_batch_texts": args.batch_texts,
+        "max_in_flight": args.in_flight,
+        "chars_per_minute": args.chars_per_minute
+    }
+
+    with TranslatorServer(latency=args.latency, jitter=args.jitter, throttle_rate=args.throttle_rate,
+                          error_rate=args.error_rate, max_texts=args.max_texts,
+                          max_chars=args.max_chars) as server:
+        results = run_benchmark(args.modes.split(","), topics, server, settings)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,7 @@
 import unicodedata
 import json
 import os
+import sys
 from typing import List, Dict
 
 def normalize(word: str) -> str:
@@ -12,41 +13,112 @@ def normalize(word: str) -> str:
 
     return no_diacritics.lower()
 
+WORD_BITS = 64
+
+def _levenshtein_bitparallel(pattern: str, text: str) -> int:
+    # Myers/Hyyro bit-vector algorithm: one column of the DP matrix per
+    # character of `text`, packed into the bits of an int (len(pattern) <= WORD_BITS).
+    m = len(pattern)
+    mask = (1 << m) - 1
+    high_bit = 1 << (m - 1)
+
+    peq = {}
+    for i, ch in enumerate(pattern):
+        peq[ch] = peq.get(ch, 0) | (1 << i)
+
+    pv, mv, score = mask, 0, m
+    for ch in text:
+        eq = peq.get(ch, 0)
+        xv = eq | mv
+        xh = (((eq & pv) + pv) ^ pv) | eq
+        ph = mv | (~(xh | pv) & mask)
+        mh = pv & xh
+        if ph & high_bit:
+            score += 1
+        elif mh & high_bit:
+            score -= 1
+        ph = ((ph << 1) | 1) & mask
+        mh = (mh << 1) & mask
+        pv = mh | (~(xv | ph) & mask)
+        mv = ph & xv
+    return score
+
+def _levenshtein_two_rows(a: str, b: str) -> int:
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i] + [0] * len(b)
+        for j, cb in enumerate(b, 1):
+            current[j] = min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (ca != cb)
+            )
+        previous = current
+    return previous[-1]
+
 def levenshtein(a: str, b: str) -> int:
     if a == b:
         return 0
+
+    # Common affixes never change the distance.
+    start = 0
+    end_a, end_b = len(a), len(b)
+    while start < end_a and start < end_b and a[start] == b[start]:
+        start += 1
+    while end_a > start and end_b > start and a[end_a - 1] == b[end_b - 1]:
+        end_a -= 1
+        end_b -= 1
+    a, b = a[start:end_a], b[start:end_b]
+
+    if len(a) > len(b):
+        a, b = b, a
     if len(a) == 0:
         return len(b)
-    if len(b) == 0:
-        return len(a)
-
-    dp = [[0] * (len(b) + 1) for _ in range(len(a) + 1)]
-
-    for i in range(len(a) + 1):
-        dp[i][0] = i
-    for j in range(len(b) + 1):
-        dp[0][j] = j
-
-    for i in range(1, len(a) + 1):
-        for j in range(1, len(b) + 1):
-            cost = 0 if a[i - 1] == b[j - 1] else 1
-            dp[i][j] = min(
-                dp[i - 1][j] + 1,
-                dp[i][j - 1] + 1,
-                dp[i - 1][j - 1] + cost
-            )
 
-    return dp[-1][-1]
+    if len(a) <= WORD_BITS:
+        return _levenshtein_bitparallel(a, b)
+    return _levenshtein_two_rows(a, b)
+
+class TranslationDataset:
+    """translated.json parsed and normalized once, to be shared by every analyzer.
+
+    `data` has the same shape as load_translations() output, with interned
+    language codes; `lengths` mirrors it with the length of each normalized word.
+    """
+    def __init__(self, raw_data: List[Dict]):
+        normalized_cache: Dict[str, str] = {}
+        self.data: List[Dict] = []
+        self.lengths: List[List[Dict[str, int]]] = []
+
+        for topic_entry in raw_data:
+            words = []
+            lengths = []
+            for word_entry in topic_entry["words"]:
+                normalized_entry = {}
+                entry_lengths = {}
+                for lang, word in word_entry.items():
+                    lang = sys.intern(lang)
+                    if isinstance(word, str):
+                        if word not in normalized_cache:
+                            normalized_cache[word] = normalize(word)
+                        word = normalized_cache[word]
+                        entry_lengths[lang] = len(word)
+                    normalized_entry[lang] = word
+                words.append(normalized_entry)
+                lengths.append(entry_lengths)
+            self.data.append({**topic_entry, "words": words})
+            self.lengths.append(lengths)
+
+    @classmethod
+    def from_file(cls, data_path: str) -> "TranslationDataset":
+        with open(data_path, "r", encoding="utf-8") as f:
+            return cls(json.load(f))
+
+    def word_count(self) -> int:
+        return sum(len(topic_entry["words"]) for topic_entry in self.data)
 
 def load_translations(data_path: str) -> List[Dict]:
-    with open(data_path, "r", encoding="utf-8") as f:
-        data = json.load(f)
-
-    for topic_entry in data:
-        for word_entry in topic_entry["words"]:
-            for lang, word in word_entry.items():
-                word_entry[lang] = normalize(word)
-    return data
+    return TranslationDataset.from_file(data_path).data
 
 def get_translations_path(base_path: str) -> str:
     return os.path.join(base_path, "data", "translated.json")
@@ -1,18 +1,42 @@
+import argparse
+import hashlib
 import json
+import os
 import numpy as np
 from scipy.cluster.hierarchy import linkage, fcluster
-from scipy.spatial.distance import squareform, cosine
+from scipy.spatial import cKDTree
+from scipy.spatial.distance import pdist
+from scipy.sparse import csr_matrix
 from pathlib import Path
 
 class CommunityDetector:
+    BACKENDS = ('hierarchical', 'knn')
 
-    def __init__(self, input_file, output_file):
+    def __init__(self, input_file, output_file, backend='hierarchical', n_neighbors=10, max_iterations=100,
+                 method='average', threshold=None, n_clusters=None, resolution=0.5, seed=0):
+        if backend not in self.BACKENDS:
+            raise ValueError(f"Unknown community backend '{backend}', expected one of {self.BACKENDS}")
         self.input_file = input_file
         self.output_file = output_file
+        self.dendrogram_file = Path(output_file).with_name(Path(output_file).stem + '_dendrogram.npz')
+        self.backend = backend
+        self.n_neighbors = n_neighbors
+        self.max_iterations = max_iterations
+        self.resolution = resolution
+        self.seed = seed
+        self.method = method
+        self.threshold = threshold
+        self.n_clusters = n_clusters
         self.data = None
         self.topics = None
+        self.language_pairs = None
+        self.pair_weights = None
         self.topic_vectors = None
-        self.distance_matrix = None
+        self.condensed_distances = None
+        self.linkages = {}
+        self.dendrogram_method = None
+        self.input_sha256 = None
+        self.knn_graph = None
         self.clusters = None
         self.cluster_analysis = None
 
@@ -20,34 +44,63 @@ class CommunityDetector:
         with open(self.input_file, 'r', encoding='utf-8') as f:
             self.data = json.load(f)
 
+    @staticmethod
+    def _language_pair(edge):
+        source_lang = edge['source'].split('_')[-1]
+        target_lang = edge['target'].split('_')[-1]
+        return '-'.join(sorted([source_lang, target_lang]))
+
     def extract_topic_features(self):
+        # One column per language pair, so every topic's vector is aligned
+        # regardless of edge order or which pairs it is missing.
         self.topics = list(self.data.keys())
-        self.topic_vectors = {}
-
-        for topic in self.topics:
-            edges = self.data[topic]['edges']
-            weights = sorted([edge['weight'] for edge in edges])
-            self.topic_vectors[topic] = np.array(weights)
+        topic_weights = [
+            {self._language_pair(edge): edge['weight'] for edge in self.data[topic]['edges']}
+            for topic in self.topics
+        ]
+        self.language_pairs = sorted({pair for weights in topic_weights for pair in weights})
+        pair_index = {pair: i for i, pair in enumerate(self.language_pairs)}
+
+        features = np.full((len(self.topics), len(self.language_pairs)), np.nan)
+        for row, weights in enumerate(topic_weights):
+            features[row, [pair_index[pair] for pair in weights]] = list(weights.values())
+        self.pair_weights = features.copy()
+
+        # A missing pair takes the average weight of that pair over all topics.
+        missing_rows, missing_columns = np.nonzero(np.isnan(features))
+        features[missing_rows, missing_columns] = np.nanmean(features, axis=0)[missing_columns]
+        self.topic_vectors = features
 
     def compute_distance_matrix(self):
-        n = len(self.topics)
-        self.distance_matrix = np.zeros((n, n))
-
-        for i in range(n):
-            for j in range(i + 1, n):
-                topic_i = self.topics[i]
-                topic_j = self.topics[j]
-
-                vec_i = self.topic_vectors[topic_i]
-                vec_j = self.topic_vectors[topic_j]
+        self.condensed_distances = pdist(self.topic_vectors, metric='cosine')
+        # All-zero vectors have no direction; treat them as unrelated to everything.
+        np.nan_to_num(self.condensed_distances, copy=False, nan=1.0)
+
+    def perform_clustering(self, method=None):
+        self.method = self.dendrogram_method = method or self.method
+        self.linkages = {self.method: linkage(self.condensed_distances, method=self.method)}
+        self.cut(self.threshold, self.n_clusters)
+
+    def cut(self, threshold=None, n_clusters=None):
+        """Assign clusters from the linkage of the current method: at a merge
+        distance `threshold`, into at most `n_clusters`, or by default at the
+        70th percentile of merge distances, kept between 2 and 6 clusters."""
+        linkage_matrix = self.linkages[self.method]
+
+        if threshold is not None:
+            cluster_labels = fcluster(linkage_matrix, threshold, criterion='distance')
+        elif n_clusters is not None:
+            cluster_labels = fcluster(linkage_matrix, n_clusters, criterion='maxclust')
+        else:
+            cluster_labels = self._default_cut(linkage_matrix)
 
-                dist = cosine(vec_i, vec_j)
-                self.distance_matrix[i, j] = dist
-                self.distance_matrix[j, i] = dist
+        self.clusters = {}
+        for topic, label in zip(self.topics, cluster_labels):
+            if label not in self.clusters:
+                self.clusters[label] = []
+            self.clusters[label].append(topic)
 
-    def perform_clustering(self, method='average'):
-        condensed_dist = squareform(self.distance_matrix)
-        linkage_matrix = linkage(condensed_dist, method=method)
+    def _default_cut(self, linkage_matrix):
         n_topics = len(self.topics)
         max_clusters = min(n_topics - 1, 6)
 
@@ -67,37 +120,171 @@ class CommunityDetector:
                 cluster_labels = fcluster(linkage_matrix, best_num_clusters, criterion='maxclust')
         else:
             cluster_labels = fcluster(linkage_matrix, best_num_clusters, criterion='maxclust')
+        return cluster_labels
+
+    def _input_hash(self):
+        with open(self.input_file, 'rb') as f:
+            return hashlib.sha256(f.read()).hexdigest()
+
+    def save_dendrogram(self):
+        """Persist everything a re-cut needs, so it never touches topic_proximity.json."""
+        self.dendrogram_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = self.dendrogram_file.with_name(self.dendrogram_file.stem + '.tmp.npz')
+        np.savez(
+            tmp_file,
+            topics=np.array(self.topics, dtype=str),
+            language_pairs=np.array(self.language_pairs, dtype=str),
+            pair_weights=self.pair_weights,
+            condensed_distances=self.condensed_distances,
+            method=np.array(self.dendrogram_method),
+            input_sha256=np.array(self.input_sha256 or self._input_hash()),
+            **{f'linkage_{method}': linkage_matrix for method, linkage_matrix in self.linkages.items()}
+        )
+        os.replace(tmp_file, self.dendrogram_file)
+
+    def load_dendrogram(self):
+        with np.load(self.dendrogram_file) as artifact:
+            self.topics = artifact['topics'].tolist()
+            self.language_pairs = artifact['language_pairs'].tolist()
+            self.pair_weights = artifact['pair_weights']
+            self.condensed_distances = artifact['condensed_distances']
+            self.method = self.dendrogram_method = str(artifact['method'])
+            self.linkages = {name[len('linkage_'):]: artifact[name]
+                             for name in artifact.files if name.startswith('linkage_')}
+            self.input_sha256 = str(artifact['input_sha256'])
+
+        if os.path.exists(self.input_file) and self._input_hash() != self.input_sha256:
+            print(f"Warning: {self.input_file} changed since {self.dendrogram_file} was built; "
+                  "run without re-cutting to rebuild it.")
+
+    def recut(self, threshold=None, n_clusters=None, method=None):
+        """Re-cut the cached dendrogram and rewrite the communities output.
+
+        Only a new linkage `method` needs work beyond fcluster: it is linked
+        from the cached distances and added to the artifact.
+        """
+        if self.condensed_distances is None:
+            self.load_dendrogram()
+
+        self.method = method or self.method
+        new_linkage = self.method not in self.linkages
+        if new_linkage:
+            self.linkages[self.method] = linkage(self.condensed_distances, method=self.method)
+
+        self.cut(threshold, n_clusters)
+        self.analyze_language_pairs()
+        self.save_results()
+        if new_linkage:
+            self.save_dendrogram()
+        return self.clusters
+
+    def build_knn_graph(self):
+        # On unit vectors Euclidean distance is a monotone function of cosine
+        # distance, so a KD-tree finds the cosine nearest neighbours without
+        # an n x n matrix.
+        norms = np.linalg.norm(self.topic_vectors, axis=1, keepdims=True)
+        unit_vectors = np.divide(self.topic_vectors, norms, out=np.zeros_like(self.topic_vectors), where=norms > 0)
+
+        n_topics = len(self.topics)
+        k = min(self.n_neighbors, n_topics - 1)
+        if k < 1:
+            self.knn_graph = csr_matrix((n_topics, n_topics))
+            return
+
+        distances, neighbours = cKDTree(unit_vectors).query(unit_vectors, k=k + 1)
+        rows = np.repeat(np.arange(n_topics), k)
+        # Drop each topic's match with itself; with duplicate vectors it is not always the first hit.
+        keep = neighbours[:, 1:].ravel() != rows
+        similarities = np.clip(1.0 - distances[:, 1:].ravel() ** 2 / 2, 0.0, None)
+
+        graph = csr_matrix((similarities[keep], (rows[keep], neighbours[:, 1:].ravel()[keep])),
+                           shape=(n_topics, n_topics))
+        self.knn_graph = graph.maximum(graph.T).tocsr()
+
+    def detect_communities(self):
+        """Louvain modularity optimisation over the kNN graph.
+
+        Each level moves topics, in a seeded random order, to the neighbouring
+        community that most increases modularity, then merges every community
+        into a single node and repeats on the smaller graph. It stops once a
+        level merges nothing, so the result is deterministic for a given seed.
+        At the standard resolution of 1 modularity still splits large, sparsely
+        linked groups of a kNN graph, hence the lower default `resolution`.
+        """
+        rng = np.random.default_rng(self.seed)
+        graph = self.knn_graph
+        labels = np.arange(len(self.topics))
+
+        while graph.nnz:
+            level_labels, moved = self._move_nodes(graph, rng)
+            if not moved:
+                break
+            _, level_labels = np.unique(level_labels, return_inverse=True)
+            labels = level_labels[labels]
+            n_nodes, n_communities = graph.shape[0], level_labels.max() + 1
+            membership = csr_matrix((np.ones(n_nodes), (np.arange(n_nodes), level_labels)),
+                                    shape=(n_nodes, n_communities))
+            graph = (membership.T @ graph @ membership).tocsr()
+
+        # Number communities from 1 in order of first appearance, like fcluster.
+        _, first_seen = np.unique(labels, return_index=True)
+        order = {label: i + 1 for i, label in enumerate(labels[np.sort(first_seen)])}
+        cluster_labels = [order[label] for label in labels]
 
         self.clusters = {}
         for topic, label in zip(self.topics, cluster_labels):
-            if label not in self.clusters:
-                self.clusters[label] = []
-            self.clusters[label].append(topic)
+            self.clusters.setdefault(label, []).append(topic)
+
+    def _move_nodes(self, graph, rng):
+        """One Louvain local-moving phase; returns the node labels and whether any node moved."""
+        n_nodes = graph.shape[0]
+        degrees = np.asarray(graph.sum(axis=1)).ravel()
+        total_weight = degrees.sum()
+        labels = np.arange(n_nodes)
+        community_degrees = degrees.copy()
+        moved = False
+
+        for _ in range(self.max_iterations):
+            changed = False
+            for node in rng.permutation(n_nodes):
+                start, end = graph.indptr[node], graph.indptr[node + 1]
+                neighbours, weights = graph.indices[start:end], graph.data[start:end]
+                # Self-loops of merged nodes stay with the node wherever it goes.
+                others = neighbours != node
+                if not others.any():
+                    continue
+
+                current = labels[node]
+                community_degrees[current] -= degrees[node]
+                candidates, positions = np.unique(labels[neighbours[others]], return_inverse=True)
+                links = np.bincount(positions, weights=weights[others])
+                gains = links - self.resolution * community_degrees[candidates] * degrees[node] / total_weight
+
+                stay = np.flatnonzero(candidates == current)
+                stay_gain = gains[stay[0]] if len(stay) else \
+                    -self.resolution * community_degrees[current] * degrees[node] / total_weight
+                best = np.argmax(gains)
+                if gains[best] > stay_gain + 1e-12:
+                    labels[node] = candidates[best]
+                    changed = moved = True
+                community_degrees[labels[node]] += degrees[node]
+            if not changed:
+                break
+        return labels, moved
 
     def analyze_language_pairs(self):
         self.cluster_analysis = []
+        topic_rows = {topic: row for row, topic in enumerate(self.topics)}
 
         for cluster_id, topic_list in sorted(self.clusters.items()):
-            all_edges = []
-            for topic in topic_list:
-                all_edges.extend(self.data[topic]['edges'])
+            cluster_weights = self.pair_weights[[topic_rows[topic] for topic in topic_list]]
 
-            language_pair_weights = {}
-
-            for edge in all_edges:
-                source_lang = edge['source'].split('_')[-1]
-                target_lang = edge['target'].split('_')[-1]
-
-                pair = '-'.join(sorted([source_lang, target_lang]))
-
-                if pair not in language_pair_weights:
-                    language_pair_weights[pair] = []
-                language_pair_weights[pair].append(edge['weight'])
-
-            avg_weights = {
-                pair: np.mean(weights)
-                for pair, weights in language_pair_weights.items()
-            }
+            avg_weights = {}
+            for column, pair in enumerate(self.language_pairs):
+                weights = cluster_weights[:, column]
+                weights = weights[~np.isnan(weights)]
+                if len(weights):
+                    avg_weights[pair] = np.mean(weights)
 
             sorted_pairs = sorted(avg_weights.items(), key=lambda x: x[1], reverse=True)
 
@@ -124,18 +311,44 @@ class CommunityDetector:
     def run(self):
         self.load_data()
         self.extract_topic_features()
-        self.compute_distance_matrix()
-        self.perform_clustering()
+        if self.backend == 'knn':
+            self.build_knn_graph()
+            self.detect_communities()
+        else:
+            self.compute_distance_matrix()
+            self.perform_clustering()
+            self.save_dendrogram()
         self.analyze_language_pairs()
         self.save_results()
 
 
 def main():
-    INPUT = '../../../data/analysis/topic_proximity.json'
-    OUTPUT = '../../../data/analysis/communities.json'
-
-    clusterer = CommunityDetector(INPUT, OUTPUT)
-    clusterer.run()
+    base_path = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../.."))
+
+    parser = argparse.ArgumentParser(description="Group topics into communities by language-pair proximity.")
+    parser.add_argument("--input", default=os.path.join(base_path, "data", "analysis", "topic_proximity.json"))
+    parser.add_argument("--output", default=os.path.join(base_path, "data", "analysis", "communities.json"))
+    parser.add_argument("--backend", choices=CommunityDetector.BACKENDS, default="hierarchical")
+    parser.add_argument("--neighbors", type=int, default=10, help="neighbours per topic for the knn backend")
+    parser.add_argument("--resolution", type=float, default=0.5,
+                        help="modularity resolution for the knn backend; higher values give more communities")
+    parser.add_argument("--method", default=None, help="linkage method (default: average, or the cached one)")
+    cut = parser.add_mutually_exclusive_group()
+    cut.add_argument("--threshold", type=float, default=None, help="cut the dendrogram at this merge distance")
+    cut.add_argument("--clusters", type=int, default=None, help="cut the dendrogram into at most this many clusters")
+    parser.add_argument("--recut", action="store_true",
+                        help="re-cut the cached dendrogram instead of rebuilding it from the input")
+    args = parser.parse_args()
+
+    clusterer = CommunityDetector(args.input, args.output, backend=args.backend, n_neighbors=args.neighbors,
+                                  method=args.method or 'average', threshold=args.threshold,
+                                  n_clusters=args.clusters, resolution=args.resolution)
+    if args.recut:
+        clusters = clusterer.recut(args.threshold, args.clusters, args.method)
+    else:
+        clusterer.run()
+        clusters = clusterer.clusters
+    print(f"{len(clusters)} communities saved to {args.output}")
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    main()
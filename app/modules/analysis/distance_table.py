@@ -0,0 +1,75 @@
+import itertools
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Tuple, Iterator, Iterable
+from .common_functions import levenshtein, TranslationDataset
+
+LanguagePair = Tuple[str, str]
+
+def pair_key(lang_a: str, lang_b: str) -> LanguagePair:
+    """Order-independent key for a language pair."""
+    return (lang_a, lang_b) if lang_a <= lang_b else (lang_b, lang_a)
+
+def topic_languages(words: List[Dict]) -> List[str]:
+    """Languages used in a topic, in order of first appearance."""
+    return list(dict.fromkeys(lang for word_entry in words for lang in word_entry if lang != "topic"))
+
+def compute_topic_distances(words: List[Dict], lengths: List[Dict[str, int]]) -> List[Dict[LanguagePair, float]]:
+    """Normalized Levenshtein distance of every language pair, for each word entry of a topic."""
+    languages = topic_languages(words)
+    rows = []
+    for word_entry, word_lengths in zip(words, lengths):
+        present = [lang for lang in languages if word_entry.get(lang)]
+        row = {}
+        for lang_a, lang_b in itertools.combinations(present, 2):
+            max_len = max(word_lengths[lang_a], word_lengths[lang_b])
+            row[pair_key(lang_a, lang_b)] = levenshtein(word_entry[lang_a], word_entry[lang_b]) / max_len
+        rows.append(row)
+    return rows
+
+def _compute_topic_distances_job(job: Tuple[List[Dict], List[Dict[str, int]]]) -> List[Dict[LanguagePair, float]]:
+    return compute_topic_distances(*job)
+
+class DistanceTable:
+    """Per-word, per-language-pair distances for a whole translation set.
+
+    Computed once and shared by the global, topic and word distance analyzers,
+    which only aggregate or reshape it. With `workers` > 1 topics are spread
+    over a process pool in chunks of `chunk_size`; results are collected in
+    topic order, so the table is identical to a serial build.
+
+    `topics` limits the up-front computation to those topic indices (the ones
+    an incremental run expects to need); any other topic is computed lazily
+    the first time `rows` asks for it.
+    """
+    def __init__(self, dataset: TranslationDataset, workers: int = 1, chunk_size: int = 1,
+                 topics: Iterable[int] = None):
+        self.dataset = dataset
+        self.translated_data = dataset.data
+        self._rows: Dict[int, List[Dict[LanguagePair, float]]] = {}
+        self._lock = threading.Lock()
+
+        indices = range(len(dataset.data)) if topics is None else sorted(set(topics))
+        jobs = [(dataset.data[i]["words"], dataset.lengths[i]) for i in indices]
+        if workers > 1 and len(jobs) > 1:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                results = executor.map(_compute_topic_distances_job, jobs, chunksize=max(1, chunk_size))
+                self._rows.update(zip(indices, results))
+        else:
+            self._rows.update((i, _compute_topic_distances_job(job)) for i, job in zip(indices, jobs))
+
+    def rows(self, index: int) -> List[Dict[LanguagePair, float]]:
+        with self._lock:
+            if index not in self._rows:
+                self._rows[index] = compute_topic_distances(self.dataset.data[index]["words"],
+                                                            self.dataset.lengths[index])
+            return self._rows[index]
+
+    def __iter__(self) -> Iterator[Tuple[Dict, List[Dict[LanguagePair, float]]]]:
+        for index, topic_entry in enumerate(self.translated_data):
+            yield topic_entry, self.rows(index)
+
+    def comparisons(self) -> int:
+        """Levenshtein comparisons made so far."""
+        with self._lock:
+            return sum(len(row) for rows in self._rows.values() for row in rows)
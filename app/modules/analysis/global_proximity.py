@@ -1,43 +1,79 @@
-import json
 import os
 import itertools
-from statistics import mean
-from .common_functions import levenshtein, normalize, load_translations
+from fractions import Fraction
+from typing import Dict, Iterable, Optional, Tuple
+from .common_functions import TranslationDataset
+from .distance_table import DistanceTable, LanguagePair, pair_key
+from .json_output import dump_json_atomic
+from .manifest import AnalysisManifest, PartialSums
+
+def exact_sum(values: Iterable[float]) -> Fraction:
+    """Exact sum of floats; dividing it by the count gives the same result as statistics.mean."""
+    numerators: Dict[int, int] = {}
+    for value in values:
+        numerator, denominator = value.as_integer_ratio()
+        numerators[denominator] = numerators.get(denominator, 0) + numerator
+    return sum((Fraction(numerator, denominator) for denominator, numerator in numerators.items()), Fraction(0))
+
+def topic_partial_sums(rows_per_entry: Iterable) -> PartialSums:
+    """Per-language-pair distance sums and counts over the rows of one topic title."""
+    values: Dict[LanguagePair, list] = {}
+    for rows in rows_per_entry:
+        for row in rows:
+            for pair, normalized_dist in row.items():
+                values.setdefault(pair, []).append(normalized_dist)
+    return {"|".join(pair): (exact_sum(distances), len(distances)) for pair, distances in values.items()}
 
 class GlobalProximityAnalyzer:
-    def __init__(self, data_path: str, output_path: str):
+    def __init__(self, data_path: str, output_path: str, dataset: TranslationDataset = None,
+                 distance_table: DistanceTable = None, manifest: AnalysisManifest = None,
+                 indent: Optional[int] = 2):
         self.data_path = data_path
         self.output_path = output_path
+        self.dataset = dataset
+        self.distance_table = distance_table
+        self.manifest = manifest
+        self.indent = indent
         self.translated_data = None
         self.global_data = None
 
     def load_data(self):
-        self.translated_data = load_translations(self.data_path)
+        if self.dataset is None:
+            if self.distance_table is not None:
+                self.dataset = self.distance_table.dataset
+            else:
+                self.dataset = TranslationDataset.from_file(self.data_path)
+        self.translated_data = self.dataset.data
 
     def compute_distances(self):
         languages = [lang for lang in self.translated_data[0]["words"][0].keys() if lang != "topic"]
         lang_pairs = list(itertools.combinations(languages, 2))
 
-        distances_acc = {f"{lang_a}-{lang_b}": [] for lang_a, lang_b in lang_pairs}
+        table = self.distance_table or DistanceTable(self.dataset)
+
+        # Sums are kept per topic title so unchanged topics can reuse the ones
+        # stored in the manifest instead of revisiting every word.
+        indices_by_topic: Dict[str, list] = {}
+        for index, topic_entry in enumerate(self.translated_data):
+            indices_by_topic.setdefault(topic_entry["topic"], []).append(index)
 
-        for topic_entry in self.translated_data:
-            for word_entry in topic_entry["words"]:
-                for lang_a, lang_b in lang_pairs:
-                    w1 = normalize(word_entry.get(lang_a))
-                    w2 = normalize(word_entry.get(lang_b))
-                    if not w1 or not w2:
-                        continue
-                    dist = levenshtein(w1, w2)
-                    max_len = max(len(w1), len(w2))
-                    normalized_dist = dist / max_len if max_len > 0 else 0
-                    distances_acc[f"{lang_a}-{lang_b}"].append(normalized_dist)
+        totals: Dict[str, Tuple[Fraction, int]] = {}
+        for topic, indices in indices_by_topic.items():
+            sums = self.manifest.partial_sums(topic) if self.manifest is not None else None
+            if sums is None:
+                sums = topic_partial_sums(table.rows(index) for index in indices)
+                if self.manifest is not None:
+                    self.manifest.set_partial_sums(topic, sums)
+            for pair, (total, count) in sums.items():
+                running_total, running_count = totals.get(pair, (Fraction(0), 0))
+                totals[pair] = (running_total + total, running_count + count)
 
         global_distances = {}
-        for pair, values in distances_acc.items():
-            if values:
-                avg_distance = mean(values)
+        for lang_a, lang_b in lang_pairs:
+            total, count = totals.get("|".join(pair_key(lang_a, lang_b)), (Fraction(0), 0))
+            if count:
+                avg_distance = float(total / count)
                 weight = round(1 - avg_distance, 4)
-                lang_a, lang_b = pair.split("-")
                 key = f"{lang_a}-{lang_b}"
                 global_distances[key] = weight
 
@@ -50,9 +86,7 @@ class GlobalProximityAnalyzer:
         self.global_data = {"language": {"nodes": nodes, "edges": edges}}
 
     def save_results(self):
-        os.makedirs(os.path.dirname(self.output_path), exist_ok=True)
-        with open(self.output_path, "w", encoding="utf-8") as f:
-            json.dump(self.global_data, f, indent=2, ensure_ascii=False)
+        dump_json_atomic(self.global_data, self.output_path, self.indent)
 
     def run(self):
         self.load_data()
@@ -0,0 +1,57 @@
+import json
+import os
+from typing import Any, Optional
+
+def dump_json_atomic(data: Any, path: str, indent: Optional[int] = None) -> None:
+    """json.dump to a temporary file next to `path`, then rename it into place."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = path + ".tmp"
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=indent, ensure_ascii=False)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+class JsonObjectWriter:
+    """Writes a JSON object one member at a time, so the whole object never has
+    to be held in memory.
+
+    The output is byte-identical to json.dump(obj, indent=indent,
+    ensure_ascii=False). It goes to a temporary file that is renamed over
+    `path` only when the `with` block exits cleanly.
+    """
+    def __init__(self, path: str, indent: Optional[int] = None):
+        self.path = path
+        self.indent = indent
+        self.count = 0
+        self._tmp_path = path + ".tmp"
+        self._file = None
+
+    def __enter__(self) -> "JsonObjectWriter":
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        self._file = open(self._tmp_path, "w", encoding="utf-8")
+        self._file.write("{")
+        return self
+
+    def write(self, key: str, value: Any) -> None:
+        encoded_key = json.dumps(key, ensure_ascii=False)
+        if self.indent is None:
+            separator = ", " if self.count else ""
+            self._file.write(f"{separator}{encoded_key}: {json.dumps(value, ensure_ascii=False)}")
+        else:
+            padding = "\n" + " " * self.indent
+            encoded_value = json.dumps(value, indent=self.indent, ensure_ascii=False).replace("\n", padding)
+            self._file.write(f"{',' if self.count else ''}{padding}{encoded_key}: {encoded_value}")
+        self.count += 1
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is not None:
+            self._file.close()
+            os.remove(self._tmp_path)
+            return
+        self._file.write("\n}" if self.indent is not None and self.count else "}")
+        self._file.close()
+        os.replace(self._tmp_path, self.path)
@@ -0,0 +1,81 @@
+import hashlib
+import json
+import os
+from fractions import Fraction
+from typing import Dict, Optional, Set, Tuple
+from .common_functions import TranslationDataset
+
+PartialSums = Dict[str, Tuple[Fraction, int]]
+
+def topic_hashes(dataset: TranslationDataset) -> Dict[str, str]:
+    """Content hash of every topic's normalized words, keyed by topic title."""
+    grouped: Dict[str, list] = {}
+    for topic_entry in dataset.data:
+        grouped.setdefault(topic_entry["topic"], []).append(topic_entry["words"])
+    return {
+        topic: hashlib.sha256(json.dumps(words, sort_keys=True, ensure_ascii=False).encode("utf-8")).hexdigest()
+        for topic, words in grouped.items()
+    }
+
+class AnalysisManifest:
+    """Record of what the analysis outputs were computed from.
+
+    Stores a content hash per topic of translated.json plus each topic's exact
+    per-language-pair distance sums and counts, so a later run only recomputes
+    changed topics and global proximity can be re-aggregated from the sums.
+    """
+    VERSION = 1
+
+    def __init__(self, path: str):
+        self.path = path
+        self.topics: Dict[str, Dict] = {}
+        self.hashes: Dict[str, str] = {}
+        self.changed: Optional[Set[str]] = None
+
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                stored = json.load(f)
+            if stored.get("version") == self.VERSION:
+                self.topics = stored.get("topics", {})
+
+    def compare(self, dataset: TranslationDataset, force: bool = False) -> Optional[Set[str]]:
+        """Topics that are new or changed since the manifest was written; None
+        without a previous run or with `force`, meaning every topic is recomputed.
+
+        Stored sums of changed and removed topics are dropped here, so a stage
+        that does not rerun cannot leave stale sums under a new hash.
+        """
+        self.hashes = topic_hashes(dataset)
+        if force or not self.topics:
+            self.changed = None
+        else:
+            self.changed = {topic for topic, digest in self.hashes.items()
+                            if self.topics.get(topic, {}).get("hash") != digest}
+        self.topics = {topic: entry for topic, entry in self.topics.items()
+                       if topic in self.hashes and self.is_unchanged(topic)}
+        return self.changed
+
+    def is_unchanged(self, topic: str) -> bool:
+        return self.changed is not None and topic not in self.changed
+
+    def partial_sums(self, topic: str) -> Optional[PartialSums]:
+        stored = self.topics.get(topic, {}).get("partial_sums")
+        if stored is None or not self.is_unchanged(topic):
+            return None
+        return {pair: (Fraction(numerator, denominator), count)
+                for pair, (numerator, denominator, count) in stored.items()}
+
+    def set_partial_sums(self, topic: str, sums: PartialSums) -> None:
+        self.topics.setdefault(topic, {})["partial_sums"] = {
+            pair: [total.numerator, total.denominator, count] for pair, (total, count) in sums.items()
+        }
+
+    def save(self) -> None:
+        """Record the current hashes, dropping topics that no longer exist."""
+        self.topics = {topic: {**self.topics.get(topic, {}), "hash": digest}
+                       for topic, digest in self.hashes.items()}
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": self.VERSION, "topics": self.topics}, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
@@ -1,6 +1,9 @@
 import json
+import numpy as np
 from typing import Dict, List, Any, Tuple, Optional
 from pathlib import Path
+from .json_output import dump_json_atomic
+from .word_distance_columns import WordDistanceColumns, columns_path
 
 
 class OutlierDetector:
@@ -11,20 +14,33 @@ class OutlierDetector:
             output_dir: str = "../../../data/analysis",
             outlier_multiplier: float = 2.5,
             min_topic_distance: float = 0.01,
+            word_columns_path: Optional[str] = None,
+            indent: Optional[int] = 2,
     ):
         self.word_distances_path = Path(word_distances_path)
+        self.word_columns_path = Path(word_columns_path or columns_path(str(word_distances_path)))
         self.topic_graph_path = Path(topic_graph_path)
         self.output_dir = Path(output_dir)
         self.output_file = self.output_dir / "outliers.json"
 
         self.outlier_multiplier = outlier_multiplier
         self.min_topic_distance = min_topic_distance
+        self.indent = indent
 
         self.word_distances: List[Dict[str, Any]] = []
+        self.word_columns: Optional[WordDistanceColumns] = None
+        self.word_pair_count = 0
         self.topic_distance_map: Dict[Tuple[str, str], float] = {}
+        self.outliers: List[Dict[str, Any]] = []
 
     def load_word_distances(self) -> None:
         """Load list of word translation distances."""
+        if WordDistanceColumns.exists(str(self.word_columns_path)):
+            self.word_columns = WordDistanceColumns(str(self.word_columns_path))
+            self.word_pair_count = len(self.word_columns)
+            print(f"Loaded {self.word_pair_count} word pairs.")
+            return
+
         with open(self.word_distances_path, 'r', encoding='utf-8') as f:
             raw_data = json.load(f)
 
@@ -60,6 +76,7 @@ class OutlierDetector:
                     "distance": distance
                 })
 
+        self.word_pair_count = len(self.word_distances)
         print(f"Loaded {len(self.word_distances)} word pairs.")
 
     def load_and_parse_topic_graph(self) -> None:
@@ -110,6 +127,9 @@ class OutlierDetector:
         return self.topic_distance_map.get(rev_key)
 
     def detect_outliers(self) -> List[Dict[str, Any]]:
+        if self.word_columns is not None:
+            return self.detect_outliers_vectorized()
+
         outliers = []
 
         for item in self.word_distances:
@@ -142,6 +162,60 @@ class OutlierDetector:
         outliers.sort(key=lambda x: x["ratio"], reverse=True)
         return outliers
 
+    def detect_outliers_vectorized(self) -> List[Dict[str, Any]]:
+        """Same result as the per-pair loop, computed over the columnar word distances."""
+        columns = self.word_columns
+        languages = columns.languages
+        topic_ids = np.asarray(columns["topic"])
+        # Pair ids are keyed in sorted language order, as in the topic distance map.
+        pair_ids = np.asarray(columns["pair"])
+        pairs = columns.pairs
+        src_langs = np.asarray(columns["src_lang"])
+        tgt_langs = np.asarray(columns["tgt_lang"])
+        distances = np.asarray(columns["distance"])
+        topics = [topic.lower() for topic in columns.topics]
+
+        baselines = np.full((len(topics), len(pairs)), np.nan)
+        for topic_id, topic in enumerate(topics):
+            for pair_id, pair in enumerate(pairs):
+                topic_dist = self.topic_distance_map.get((topic, pair))
+                if topic_dist is not None:
+                    baselines[topic_id, pair_id] = topic_dist
+        topic_dists = baselines[topic_ids, pair_ids]
+
+        def word_pair(row: int) -> str:
+            src_lang, tgt_lang = languages[src_langs[row]], languages[tgt_langs[row]]
+            return (f"{columns.words[columns['src_word'][row]]} ({src_lang}) - "
+                    f"{columns.words[columns['tgt_word'][row]]} ({tgt_lang})")
+
+        missing = np.isnan(topic_dists)
+        for row in np.flatnonzero(missing).tolist():
+            print(f"  Warning: No topic distance for '{topics[topic_ids[row]]}' | {pairs[pair_ids[row]]} "
+                  f"→ skipping {word_pair(row)}")
+
+        with np.errstate(invalid='ignore'):
+            mask = ~missing & (topic_dists >= self.min_topic_distance) \
+                   & (distances > topic_dists * self.outlier_multiplier)
+
+        rows = np.flatnonzero(mask)
+        ratios = distances[rows] / topic_dists[rows]
+
+        # Python's round, not np.round, so ratios and their sort order match the JSON path exactly.
+        outliers = []
+        for row, distance, topic_dist, ratio in zip(rows.tolist(), distances[rows].tolist(),
+                                                    topic_dists[rows].tolist(), ratios.tolist()):
+            outliers.append({
+                "topic": topics[topic_ids[row]],
+                "language_pair": pairs[pair_ids[row]],
+                "word_pair": word_pair(row),
+                "distance": round(distance, 4),
+                "topic_distance": round(topic_dist, 4),
+                "ratio": round(ratio, 2)
+            })
+
+        outliers.sort(key=lambda x: x["ratio"], reverse=True)
+        return outliers
+
     def save_results(self, outliers: List[Dict[str, Any]]) -> None:
         self.output_dir.mkdir(parents=True, exist_ok=True)
 
@@ -157,8 +231,7 @@ class OutlierDetector:
             ]
         }
 
-        with open(self.output_file, 'w', encoding='utf-8') as f:
-            json.dump(final_output, f, indent=2, ensure_ascii=False)
+        dump_json_atomic(final_output, str(self.output_file), self.indent)
 
         print(f"\nFound {len(outliers)} outliers.")
         print(f"Results saved to: {self.output_file}")
@@ -166,8 +239,8 @@ class OutlierDetector:
     def run(self) -> None:
         self.load_word_distances()
         self.load_and_parse_topic_graph()
-        outliers = self.detect_outliers()
-        self.save_results(outliers)
+        self.outliers = self.detect_outliers()
+        self.save_results(self.outliers)
 
 
 if __name__ == "__main__":
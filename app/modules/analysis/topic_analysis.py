@@ -2,40 +2,62 @@ import os
 import itertools
 import json
 from statistics import mean
-from .common_functions import normalize, levenshtein, load_translations
+from typing import Optional
+from .common_functions import TranslationDataset
+from .distance_table import DistanceTable, pair_key
+from .json_output import dump_json_atomic
+from .manifest import AnalysisManifest
 
 class TopicAnalyzer:
-    def __init__(self, data_path: str, output_path: str):
+    def __init__(self, data_path: str, output_path: str, dataset: TranslationDataset = None,
+                 distance_table: DistanceTable = None, manifest: AnalysisManifest = None,
+                 indent: Optional[int] = 4):
         self.data_path = data_path
         self.output_path = output_path
+        self.dataset = dataset
+        self.distance_table = distance_table
+        self.manifest = manifest
+        self.indent = indent
         self.translated_data = None
         self.results = None
 
     def load_data(self):
-        self.translated_data = load_translations(self.data_path)
+        if self.dataset is None:
+            if self.distance_table is not None:
+                self.dataset = self.distance_table.dataset
+            else:
+                self.dataset = TranslationDataset.from_file(self.data_path)
+        self.translated_data = self.dataset.data
+
+    def load_previous_results(self):
+        if self.manifest is None or self.manifest.changed is None or not os.path.exists(self.output_path):
+            return {}
+        with open(self.output_path, "r", encoding="utf-8") as f:
+            return json.load(f)
 
     def compute_distances(self):
         self.results = {}
+        table = self.distance_table or DistanceTable(self.dataset)
+        previous = self.load_previous_results()
 
-        for topic_entry in self.translated_data:
+        for index, topic_entry in enumerate(self.translated_data):
             topic = topic_entry["topic"]
             words = topic_entry["words"]
 
+            if topic in previous and self.manifest.is_unchanged(topic):
+                self.results[topic] = previous[topic]
+                continue
+            rows = table.rows(index)
+
             languages = [lang for lang in words[0].keys() if lang != "topic"]
             pair_distances = {f"{a}-{b}": [] for a,b in itertools.combinations(languages,2)}
-            max_word_length = {}
 
-            for word_entry in words:
+            for row in rows:
                 for lang_a, lang_b in itertools.combinations(languages,2):
-                    w1 = normalize(word_entry.get(lang_a))
-                    w2 = normalize(word_entry.get(lang_b))
-                    if not w1 or not w2:
+                    normalized_dist = row.get(pair_key(lang_a, lang_b))
+                    if normalized_dist is None:
                         continue
-                    dist = levenshtein(w1, w2)
-                    normalized_dist = dist / max(len(w1), len(w2))
-                    key = f"{lang_a}-{lang_b}"
-                    pair_distances[key].append(normalized_dist)
-                    max_word_length[key] = max(max_word_length.get(key,0), len(w1), len(w2))
+                    pair_distances[f"{lang_a}-{lang_b}"].append(normalized_dist)
 
             nodes = [{"id": f"{lang}"} for lang in languages]
             edges = []
@@ -58,9 +80,7 @@ class TopicAnalyzer:
             }
 
     def save_results(self):
-        os.makedirs(os.path.dirname(self.output_path), exist_ok=True)
-        with open(self.output_path,"w",encoding="utf-8") as f:
-            json.dump(self.results,f,indent=4,ensure_ascii=False)
+        dump_json_atomic(self.results, self.output_path, self.indent)
 
     def run(self):
         self.load_data()
@@ -1,79 +1,180 @@
 import json
 import os
 import itertools
-from typing import List, Dict
-from .common_functions import levenshtein, load_translations
+from contextlib import nullcontext
+from typing import List, Dict, Tuple, Iterable, Iterator, Optional
+import numpy as np
+from .common_functions import TranslationDataset
+from .distance_table import DistanceTable, pair_key, topic_languages
+from .manifest import AnalysisManifest
+from .json_output import JsonObjectWriter
+from .word_distance_columns import WordDistanceColumns, WordDistanceColumnsWriter, WordPair, columns_path
 
 class WordDistanceAnalyzer:
-    def __init__(self, data_path: str, output_path: str):
+    def __init__(self, data_path: str, output_path: str, dataset: TranslationDataset = None,
+                 distance_table: DistanceTable = None, manifest: AnalysisManifest = None,
+                 export_json: bool = True, indent: Optional[int] = 2):
         self.data_path = data_path
         self.output_path = output_path
+        self.columns_path = columns_path(output_path)
+        self.export_json = export_json
+        self.indent = indent
+        self.dataset = dataset
+        self.distance_table = distance_table
+        self.manifest = manifest
         self.translated_data = None
         self.graph_data: Dict = {}
+        self.word_pairs: Dict[str, List[WordPair]] = {}
+        self.graph_count = 0
+        self.edge_count = 0
 
     def load_and_normalize_translations(self) -> None:
-        self.translated_data = load_translations(self.data_path)
+        if self.dataset is None:
+            if self.distance_table is not None:
+                self.dataset = self.distance_table.dataset
+            else:
+                self.dataset = TranslationDataset.from_file(self.data_path)
+        self.translated_data = self.dataset.data
         print(f"Loaded and normalized {sum(len(t['words']) for t in self.translated_data)} words across topics.")
 
-    def compute_distances(self) -> None:
+    def load_previous_weights(self) -> Dict[str, Tuple[str, List[float]]]:
+        """Topic and edge weights of every word graph in the previous output."""
+        if self.manifest is None or self.manifest.changed is None:
+            return {}
+
+        previous = {}
+        if WordDistanceColumns.exists(self.columns_path):
+            columns = WordDistanceColumns(self.columns_path)
+            entries = columns["entry"]
+            starts = [0] + (np.flatnonzero(np.diff(entries)) + 1).tolist()
+            ends = starts[1:] + [len(entries)]
+            for start, end in zip(starts, ends):
+                if start == end:
+                    continue
+                # distance was stored as 1 - weight; rounding recovers the exact weight.
+                weights = [round(1.0 - distance, 4) for distance in columns["distance"][start:end].tolist()]
+                previous[columns.words[entries[start]]] = (columns.topics[columns["topic"][start]], weights)
+        elif os.path.exists(self.output_path):
+            with open(self.output_path, "r", encoding="utf-8") as f:
+                for key_word, graph in json.load(f).items():
+                    previous[key_word] = (graph["topic"], [edge["weight"] for edge in graph["edges"]])
+        return previous
+
+    @staticmethod
+    def word_languages(word_entry: Dict, all_langs: List[str]) -> List[str]:
+        return [lang for lang in all_langs if word_entry.get(lang)]
+
+    def build_word_graph(self, topic: str, word_entry: Dict, weights: List[float], all_langs: List[str]) -> Dict:
+        graph = {"topic": topic, "nodes": [], "edges": []}
+
+        for lang in all_langs:
+            word = word_entry.get(lang, "")
+            if word:
+                node_id = f"{word}_{lang}"
+                graph["nodes"].append({"id": node_id})
+
+        languages = self.word_languages(word_entry, all_langs)
+        for (lang_a, lang_b), weight in zip(itertools.combinations(languages, 2), weights):
+            w1 = word_entry[lang_a]
+            w2 = word_entry[lang_b]
+
+            source = f"{w1}_{lang_a}"
+            target = f"{w2}_{lang_b}"
+
+            graph["edges"].append({
+                "source": source,
+                "target": target,
+                "weight": weight
+            })
+        return graph
+
+    def iter_word_graphs(self) -> Iterator[Tuple[str, Dict, List[WordPair]]]:
+        """(key word, graph, word pairs) in output order, computed one word at a time."""
+        table = self.distance_table or DistanceTable(self.dataset)
+        previous = self.load_previous_weights()
+
+        # A word keeps the position of its first occurrence but the graph of
+        # its last one, so that graph is built as soon as the word first appears.
+        owners = {}
+        for index, topic_entry in enumerate(self.translated_data):
+            for word_index, word_entry in enumerate(topic_entry["words"]):
+                if "en" in word_entry:
+                    owners[word_entry["en"]] = (index, word_index)
+
+        topic_langs = {}
+        emitted = set()
         for topic_entry in self.translated_data:
-            topic = topic_entry["topic"].lower()
-            words = topic_entry["words"]
-
-            all_langs = set()
-            for word_entry in words:
-                all_langs.update(lang for lang in word_entry if lang != "topic")
-
-            for word_entry in words:
-                if "en" not in word_entry:
+            for word_entry in topic_entry["words"]:
+                if "en" not in word_entry or word_entry["en"] in emitted:
                     continue
                 key_word = word_entry["en"]
-                self.graph_data[key_word] = {
-                    "topic": topic,
-                    "nodes": [],
-                    "edges": []
-                }
-
-                for lang in all_langs:
-                    word = word_entry.get(lang, "")
-                    if word:
-                        node_id = f"{word}_{lang}"
-                        self.graph_data[key_word]["nodes"].append({"id": node_id})
-
-                languages = [lang for lang in all_langs if word_entry.get(lang)]
-                for lang_a, lang_b in itertools.combinations(languages, 2):
-                    w1 = word_entry.get(lang_a, "")
-                    w2 = word_entry.get(lang_b, "")
-                    if not w1 or not w2:
-                        continue
-
-                    raw_dist = levenshtein(w1, w2)
-                    max_len = max(len(w1), len(w2))
-                    normalized_dist = raw_dist / max_len if max_len > 0 else 0.0
-                    weight = round(1 - normalized_dist, 4)
-
-                    source = f"{w1}_{lang_a}"
-                    target = f"{w2}_{lang_b}"
-
-                    self.graph_data[key_word]["edges"].append({
-                        "source": source,
-                        "target": target,
-                        "weight": weight
-                    })
-
-    def save_results(self) -> None:
-        os.makedirs(os.path.dirname(self.output_path), exist_ok=True)
-        with open(self.output_path, "w", encoding="utf-8") as f:
-            json.dump(self.graph_data, f, indent=2, ensure_ascii=False)
+                emitted.add(key_word)
+
+                index, word_index = owners[key_word]
+                owner_entry = self.translated_data[index]
+                owner_word = owner_entry["words"][word_index]
+                topic = owner_entry["topic"].lower()
+                unchanged = self.manifest is not None and self.manifest.is_unchanged(owner_entry["topic"])
+
+                # First-appearance order keeps node and edge orientation stable between runs.
+                if index not in topic_langs:
+                    topic_langs[index] = topic_languages(owner_entry["words"])
+                all_langs = topic_langs[index]
+
+                languages = self.word_languages(owner_word, all_langs)
+                lang_pairs = list(itertools.combinations(languages, 2))
+                old_topic, old_weights = previous.get(key_word, (None, None))
+                if not lang_pairs:
+                    weights = []
+                elif unchanged and old_topic == topic:
+                    weights = old_weights
+                else:
+                    row = table.rows(index)[word_index]
+                    weights = [round(1 - row[pair_key(lang_a, lang_b)], 4) for lang_a, lang_b in lang_pairs]
+
+                graph = self.build_word_graph(topic, owner_word, weights, all_langs)
+                pairs = [
+                    (lang_a, owner_word[lang_a], lang_b, owner_word[lang_b], 1.0 - weight)
+                    for (lang_a, lang_b), weight in zip(lang_pairs, weights)
+                ]
+                yield key_word, graph, pairs
+
+    def compute_distances(self) -> None:
+        self.graph_data = {}
+        self.word_pairs = {}
+        for key_word, graph, pairs in self.iter_word_graphs():
+            self.graph_data[key_word] = graph
+            self.word_pairs[key_word] = pairs
+
+    def save_results(self, word_graphs: Iterable[Tuple[str, Dict, List[WordPair]]] = None) -> None:
+        """Write the columnar output and, optionally, the JSON export.
+
+        With `word_graphs` each graph is written as soon as it is produced
+        instead of from `graph_data`.
+        """
+        if word_graphs is None:
+            word_graphs = ((key_word, graph, self.word_pairs[key_word]) for key_word, graph in self.graph_data.items())
+
+        self.graph_count = 0
+        self.edge_count = 0
+        with WordDistanceColumnsWriter(self.columns_path) as columns, \
+                (JsonObjectWriter(self.output_path, self.indent) if self.export_json else nullcontext()) as export:
+            for key_word, graph, pairs in word_graphs:
+                columns.add(key_word, graph["topic"], pairs)
+                if export is not None:
+                    export.write(key_word, graph)
+                self.graph_count += 1
+                self.edge_count += len(pairs)
 
     def run(self) -> None:
         self.load_and_normalize_translations()
-        self.compute_distances()
-        self.save_results()
+        self.save_results(self.iter_word_graphs())
 
         print(f"\nWord distance analysis completed!")
-        print(f"  Output → {self.output_path}")
-        print(f"  Total word groups analyzed: {len(self.graph_data)}")
+        print(f"  Output → {self.columns_path}")
+        if self.export_json:
+            print(f"  JSON export → {self.output_path}")
+        print(f"  Total word groups analyzed: {self.graph_count}")
 
 def main():
     base_path = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../.."))
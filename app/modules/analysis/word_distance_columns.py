@@ -0,0 +1,164 @@
+import json
+import os
+import shutil
+import tempfile
+from array import array
+from typing import Dict, Iterable, List, Tuple
+import numpy as np
+
+# (source language, source word, target language, target word, distance)
+WordPair = Tuple[str, str, str, str, float]
+
+ID_COLUMNS = ("entry", "topic", "pair", "src_lang", "tgt_lang", "src_word", "tgt_word")
+COLUMNS = ID_COLUMNS + ("distance",)
+STRINGS_FILE = "strings.json"
+# Names the version directory holding the live table; replacing it is the commit.
+CURRENT_FILE = "CURRENT"
+
+def columns_path(json_path: str) -> str:
+    """Directory the columnar copy of a word distance JSON file lives in."""
+    return os.path.splitext(json_path)[0] + "_columns"
+
+class _StringTable:
+    def __init__(self):
+        self.ids: Dict[str, int] = {}
+
+    def id(self, value: str) -> int:
+        if value not in self.ids:
+            self.ids[value] = len(self.ids)
+        return self.ids[value]
+
+    def values(self) -> List[str]:
+        return list(self.ids)
+
+class WordDistanceColumns:
+    """Word-level distances as one .npy array per column plus a string table.
+
+    Every row is one translated word pair: the key word of the graph it belongs
+    to (`entry`), its topic, its language pair (the two codes sorted and joined
+    by "-"), both languages and words, and its distance (1 - edge weight). Id
+    columns index into the lists of strings.json. Arrays are opened
+    memory-mapped by default, so readers only touch the pages they use.
+
+    Each write goes to a new version directory under `path`, and the CURRENT
+    file is switched to it afterwards, so a table is always read whole from a
+    single version.
+    """
+    OPEN_ATTEMPTS = 3
+
+    def __init__(self, path: str, mmap_mode: str = "r"):
+        self.path = path
+        for attempt in range(self.OPEN_ATTEMPTS):
+            self.version_path = os.path.join(path, self.current_version(path))
+            try:
+                self._load(mmap_mode)
+                return
+            except FileNotFoundError:
+                # A writer removed this version after switching CURRENT; read the new one.
+                if attempt == self.OPEN_ATTEMPTS - 1:
+                    raise
+
+    def _load(self, mmap_mode: str) -> None:
+        with open(os.path.join(self.version_path, STRINGS_FILE), "r", encoding="utf-8") as f:
+            strings = json.load(f)
+        self.topics: List[str] = strings["topics"]
+        self.pairs: List[str] = strings["pairs"]
+        self.languages: List[str] = strings["languages"]
+        self.words: List[str] = strings["words"]
+        self.columns: Dict[str, np.ndarray] = {
+            name: np.load(os.path.join(self.version_path, f"{name}.npy"), mmap_mode=mmap_mode) for name in COLUMNS
+        }
+
+    @staticmethod
+    def current_version(path: str) -> str:
+        with open(os.path.join(path, CURRENT_FILE), "r", encoding="utf-8") as f:
+            return f.read().strip()
+
+    def __len__(self) -> int:
+        return len(self.columns["distance"])
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self.columns[name]
+
+    @staticmethod
+    def exists(path: str) -> bool:
+        return os.path.exists(os.path.join(path, CURRENT_FILE))
+
+    @staticmethod
+    def write(path: str, entries: Iterable[Tuple[str, str, List[WordPair]]]) -> int:
+        """Write (key word, topic, word pairs) entries; returns the number of rows."""
+        with WordDistanceColumnsWriter(path) as writer:
+            for key_word, topic, pairs in entries:
+                writer.add(key_word, topic, pairs)
+        return writer.rows
+
+class WordDistanceColumnsWriter:
+    """Builds a WordDistanceColumns table one word graph at a time.
+
+    Columns are accumulated as packed arrays rather than Python lists. When the
+    `with` block exits cleanly they are written to a new version directory,
+    CURRENT is atomically replaced to point at it, and only then are older
+    versions removed, so a reader never sees a partial table.
+    """
+    def __init__(self, path: str):
+        self.path = path
+        self.rows = 0
+        self._topics, self._pairs = _StringTable(), _StringTable()
+        self._languages, self._words = _StringTable(), _StringTable()
+        self._ids = {name: array("i") for name in ID_COLUMNS}
+        self._distances = array("d")
+
+    def __enter__(self) -> "WordDistanceColumnsWriter":
+        return self
+
+    def add(self, key_word: str, topic: str, pairs: List[WordPair]) -> None:
+        entry_id, topic_id = self._words.id(key_word), self._topics.id(topic)
+        for src_lang, src_word, tgt_lang, tgt_word, distance in pairs:
+            self._ids["entry"].append(entry_id)
+            self._ids["topic"].append(topic_id)
+            self._ids["pair"].append(self._pairs.id("-".join(sorted((src_lang, tgt_lang)))))
+            self._ids["src_lang"].append(self._languages.id(src_lang))
+            self._ids["tgt_lang"].append(self._languages.id(tgt_lang))
+            self._ids["src_word"].append(self._words.id(src_word))
+            self._ids["tgt_word"].append(self._words.id(tgt_word))
+            self._distances.append(distance)
+        self.rows += len(pairs)
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is not None:
+            return
+
+        os.makedirs(self.path, exist_ok=True)
+        version_path = tempfile.mkdtemp(dir=self.path, prefix="v")
+        version = os.path.basename(version_path)
+        try:
+            for name, values in self._ids.items():
+                np.save(os.path.join(version_path, f"{name}.npy"),
+                        np.frombuffer(values, dtype=np.intc).astype(np.int32))
+            np.save(os.path.join(version_path, "distance.npy"), np.frombuffer(self._distances, dtype=np.float64))
+            with open(os.path.join(version_path, STRINGS_FILE), "w", encoding="utf-8") as f:
+                json.dump({"topics": self._topics.values(), "pairs": self._pairs.values(),
+                           "languages": self._languages.values(), "words": self._words.values()},
+                          f, ensure_ascii=False)
+
+            pointer_path = os.path.join(self.path, CURRENT_FILE)
+            with open(pointer_path + ".tmp", "w", encoding="utf-8") as f:
+                f.write(version)
+            os.replace(pointer_path + ".tmp", pointer_path)
+        except BaseException:
+            shutil.rmtree(version_path, ignore_errors=True)
+            raise
+
+        # Older versions, and files of the pre-versioning layout, are only
+        # removed once nothing points at them. One still open elsewhere is
+        # left for the next write to clean up.
+        for name in os.listdir(self.path):
+            if name not in (CURRENT_FILE, version):
+                stale_path = os.path.join(self.path, name)
+                if os.path.isdir(stale_path):
+                    shutil.rmtree(stale_path, ignore_errors=True)
+                else:
+                    try:
+                        os.remove(stale_path)
+                    except OSError:
+                        pass
@@ -0,0 +1,164 @@
+import hashlib
+import os
+import random
+import threading
+import time
+import zipfile
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlsplit
+from .scraper import IFetcher, Topic
+
+
+class CorpusArchive:
+    """Compressed archive of fetched pages keyed by URL.
+
+    Every page is a deflated zip member named after the hash of its URL; the
+    URL itself is kept in the member comment so the index can be rebuilt from
+    the archive alone.
+    """
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._index: dict[str, str] | None = None
+
+    @staticmethod
+    def _member_name(url: str) -> str:
+        return f"pages/{hashlib.sha256(url.encode('utf-8')).hexdigest()}.html"
+
+    def _load_index(self) -> dict[str, str]:
+        if self._index is None:
+            self._index = {}
+            if os.path.exists(self.path):
+                with zipfile.ZipFile(self.path, "r") as archive:
+                    for info in archive.infolist():
+                        self._index[info.comment.decode("utf-8")] = info.filename
+        return self._index
+
+    def add(self, url: str, body: str) -> None:
+        with self._lock:
+            index = self._load_index()
+            if url in index:
+                return
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            info = zipfile.ZipInfo(self._member_name(url), date_time=time.localtime()[:6])
+            info.compress_type = zipfile.ZIP_DEFLATED
+            info.comment = url.encode("utf-8")
+            with zipfile.ZipFile(self.path, "a") as archive:
+                archive.writestr(info, body.encode("utf-8"))
+            index[url] = info.filename
+
+    def get(self, url: str) -> str:
+        with self._lock:
+            member = self._load_index().get(url)
+            if member is None:
+                raise LookupError(f"No archived page for {url}")
+            with zipfile.ZipFile(self.path, "r") as archive:
+                return archive.read(member).decode("utf-8")
+
+    def urls(self) -> list[str]:
+        with self._lock:
+            return list(self._load_index())
+
+
+class RecordingFetcher(IFetcher):
+    """Delegates to another fetcher and archives every page it returns."""
+    def __init__(self, fetcher: IFetcher, archive: CorpusArchive):
+        self.fetcher = fetcher
+        self.archive = archive
+
+    def fetch(self, topic: Topic) -> str:
+        html = self.fetcher.fetch(topic)
+        self.archive.add(topic.url, html)
+        return html
+
+
+class ReplayFetcher(IFetcher):
+    """Serves pages from a CorpusArchive without touching the network."""
+    def __init__(self, archive: CorpusArchive):
+        self.archive = archive
+
+    def fetch(self, topic: Topic) -> str:
+        return self.archive.get(topic.url)
+
+
+class CorpusServer:
+    """Local HTTP stand-in for the scraped site, serving pages from an archive.
+
+    Each request sleeps for `latency` seconds (plus up to `jitter`) and fails
+    with a 503 with probability `error_rate`. `url_for` maps a recorded URL
+    onto this server by moving its host into the path and keeping its query,
+    so URLs that differ only in host or query still replay different pages.
+    """
+    def __init__(self, archive: CorpusArchive, host: str = "127.0.0.1", port: int = 0,
+                 latency: float = 0.0, jitter: float = 0.0, error_rate: float = 0.0, seed: int = 0):
+        self.archive = archive
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self._random = random.Random(seed)
+        self._random_lock = threading.Lock()
+        self._pages = {}
+        for url in archive.urls():
+            key = self._page_key(url)
+            if key in self._pages:
+                raise ValueError(f"Archived URLs {self._pages[key]} and {url} map to the same replay URL {key}")
+            self._pages[key] = url
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @staticmethod
+    def _page_key(url: str) -> str:
+        parts = urlsplit(url)
+        return f"/{parts.netloc}{parts.path or '/'}" + (f"?{parts.query}" if parts.query else "")
+
+    def url_for(self, url: str) -> str:
+        return self.base_url + self._page_key(url)
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                with server._random_lock:
+                    delay = server.latency + server._random.random() * server.jitter
+                    failed = server._random.random() < server.error_rate
+                time.sleep(delay)
+
+                url = server._pages.get(self.path)
+                if failed or url is None:
+                    self.send_error(503 if failed else 404)
+                    return
+
+                body = server.archive.get(url).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self) -> "CorpusServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
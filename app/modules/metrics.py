@@ -0,0 +1,185 @@
+import cProfile
+import json
+import os
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+def peak_rss_bytes() -> Optional[int]:
+    """High-water mark of this process's resident set size, or None where unsupported."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in kilobytes elsewhere.
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+class StageMetrics:
+    """Measurements of one pipeline stage; stages add their own counters."""
+    def __init__(self, name: str):
+        self.name = name
+        self.wall_seconds = 0.0
+        self.cpu_seconds = 0.0
+        self.peak_memory_bytes: Optional[int] = None
+        self.peak_rss_bytes: Optional[int] = None
+        self.counters: Dict[str, Any] = {}
+        self.profile: Optional[Dict[str, Any]] = None
+        self.error: Optional[str] = None
+
+    def count(self, name: str, amount: int = 1) -> None:
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def set(self, name: str, value: Any) -> None:
+        self.counters[name] = value
+
+    def to_dict(self) -> Dict[str, Any]:
+        result = {
+            "stage": self.name,
+            "wall_seconds": round(self.wall_seconds, 4),
+            "cpu_seconds": round(self.cpu_seconds, 4),
+            "peak_memory_bytes": self.peak_memory_bytes,
+            "peak_rss_bytes": self.peak_rss_bytes,
+            "counters": self.counters
+        }
+        if self.profile is not None:
+            result["profile"] = self.profile
+        if self.error is not None:
+            result["error"] = self.error
+        return result
+
+
+class MetricsRecorder:
+    """Collects wall time, CPU time, peak memory and counters per stage.
+
+    CPU time is the whole process's, so for stages that run concurrently it
+    includes their neighbours' work, as does the tracemalloc peak (which also
+    misses memory used in worker processes). Tracing slows allocation-heavy
+    stages several times over and the times are then measured under that
+    overhead, so it is off unless `trace_memory` is set. The peak resident set
+    size is always recorded since it costs nothing to read, but it is the
+    process's high-water mark so far, so a stage only shows its own peak if it
+    raised the mark; worker processes are not included. With `profile_dir` set,
+    each stage is run under cProfile and its stats are dumped to
+    `<profile_dir>/<stage>.prof`.
+    """
+    PROFILE_TOP_FUNCTIONS = 15
+
+    def __init__(self, trace_memory: bool = False, profile_dir: Optional[str] = None):
+        self.trace_memory = trace_memory
+        self.profile_dir = profile_dir
+        self.stages: List[StageMetrics] = []
+        self.started = datetime.now()
+        self._lock = threading.Lock()
+        self._active = 0
+        self._started_tracing = False
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[StageMetrics]:
+        metrics = StageMetrics(name)
+        self._enter()
+        profiler = self._start_profiler()
+        wall_start, cpu_start = time.perf_counter(), time.process_time()
+        try:
+            yield metrics
+        except BaseException as e:
+            metrics.error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            metrics.wall_seconds = time.perf_counter() - wall_start
+            metrics.cpu_seconds = time.process_time() - cpu_start
+            if profiler is not None:
+                profiler.disable()
+                metrics.profile = self._save_profile(name, profiler)
+            metrics.peak_memory_bytes = self._exit()
+            metrics.peak_rss_bytes = peak_rss_bytes()
+            with self._lock:
+                self.stages.append(metrics)
+            print(self._summary(metrics))
+
+    def _enter(self) -> None:
+        with self._lock:
+            if self.trace_memory:
+                if not tracemalloc.is_tracing():
+                    tracemalloc.start()
+                    self._started_tracing = True
+                # The peak can only be reset while no other stage is measuring it.
+                if self._active == 0:
+                    tracemalloc.reset_peak()
+            self._active += 1
+
+    def _exit(self) -> Optional[int]:
+        with self._lock:
+            self._active -= 1
+            if not self.trace_memory or not tracemalloc.is_tracing():
+                return None
+            peak = tracemalloc.get_traced_memory()[1]
+            if self._active == 0 and self._started_tracing:
+                tracemalloc.stop()
+                self._started_tracing = False
+            return peak
+
+    def _start_profiler(self) -> Optional[cProfile.Profile]:
+        if self.profile_dir is None:
+            return None
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            # Only one profiler can be active at a time on newer Pythons, so
+            # overlapping stages go unprofiled.
+            return None
+        return profiler
+
+    def _save_profile(self, name: str, profiler: cProfile.Profile) -> Dict[str, Any]:
+        os.makedirs(self.profile_dir, exist_ok=True)
+        path = os.path.join(self.profile_dir, f"{name}.prof")
+        profiler.dump_stats(path)
+
+        stats = pstats.Stats(profiler).sort_stats(pstats.SortKey.CUMULATIVE)
+        top = []
+        for function in stats.fcn_list[:self.PROFILE_TOP_FUNCTIONS]:
+            _, calls, _, cumulative, _ = stats.stats[function]
+            filename, line, function_name = function
+            top.append({
+                "function": f"{os.path.basename(filename)}:{line}({function_name})",
+                "calls": calls,
+                "cumulative_seconds": round(cumulative, 4)
+            })
+        return {"path": path, "top_functions": top}
+
+    @staticmethod
+    def _summary(metrics: StageMetrics) -> str:
+        summary = f"[{metrics.name}] {metrics.wall_seconds:.2f}s wall, {metrics.cpu_seconds:.2f}s CPU"
+        if metrics.peak_memory_bytes is not None:
+            summary += f", {metrics.peak_memory_bytes / 2 ** 20:.1f} MB peak"
+        if metrics.peak_rss_bytes is not None:
+            summary += f", {metrics.peak_rss_bytes / 2 ** 20:.1f} MB peak RSS"
+        if metrics.error is not None:
+            summary += f", failed ({metrics.error})"
+        return summary
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            stages = [stage.to_dict() for stage in self.stages]
+        return {
+            "started": self.started.isoformat(timespec="seconds"),
+            "trace_memory": self.trace_memory,
+            "stages": stages
+        }
+
+    def save(self, path: str) -> None:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, indent=2, ensure_ascii=False)
+        os.replace(tmp_path, path)
@@ -1,7 +1,11 @@
-import json, requests, os, lxml
+import json, requests, os, lxml, threading, time, hashlib, tempfile
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
+from urllib.parse import urlsplit
 from bs4 import BeautifulSoup
+from lxml import etree
+from requests.adapters import HTTPAdapter
 
 @dataclass
 class Topic:
@@ -37,16 +41,150 @@ class IStorage(ABC):
     @abstractmethod
     def store(self, topic: Topic, words: list[str]) -> None:
         pass
+
+    def load_completed(self) -> dict[str, list[str]]:
+        """Topics already stored by a previous run, to be skipped when resuming."""
+        return {}
 # -------------------------
 
+class HostRateLimiter:
+    """Politeness limits per host: at most `max_concurrent` requests in flight
+    and at least `min_interval` seconds between consecutive request starts."""
+    def __init__(self, max_concurrent: int = 2, min_interval: float = 0.0):
+        self.max_concurrent = max(1, max_concurrent)
+        self.min_interval = max(0.0, min_interval)
+        self._lock = threading.Lock()
+        self._slots: dict[str, threading.BoundedSemaphore] = {}
+        self._next_start: dict[str, float] = {}
+
+    def _slot(self, host: str) -> threading.BoundedSemaphore:
+        with self._lock:
+            if host not in self._slots:
+                self._slots[host] = threading.BoundedSemaphore(self.max_concurrent)
+            return self._slots[host]
+
+    def _wait_turn(self, host: str) -> None:
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_start.get(host, now))
+            self._next_start[host] = start + self.min_interval
+        if start > now:
+            time.sleep(start - now)
+
+    def acquire(self, url: str) -> str:
+        host = urlsplit(url).netloc
+        self._slot(host).acquire()
+        self._wait_turn(host)
+        return host
+
+    def release(self, host: str) -> None:
+        self._slot(host).release()
+
 class PageFetcher(IFetcher):
     headers = {
         "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
                       "AppleWebKit/537.36 (KHTML, like Gecko) "
                       "Chrome/120.0.0.0 Safari/537.36"
     }
+    def __init__(self, pool_size: int = 10, rate_limiter: HostRateLimiter = None, timeout: float = 30):
+        self.timeout = timeout
+        self.rate_limiter = rate_limiter or HostRateLimiter()
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def _get(self, url: str, headers: dict = None) -> requests.Response:
+        host = self.rate_limiter.acquire(url)
+        try:
+            return self.session.get(url, headers=headers, allow_redirects=True, timeout=self.timeout)
+        finally:
+            self.rate_limiter.release(host)
+
+    def fetch(self, topic: Topic) -> str:
+        page = self._get(topic.url)
+        page.raise_for_status()
+        return page.text
+
+class CachedPageFetcher(PageFetcher):
+    """PageFetcher backed by an on-disk response cache keyed on URL.
+
+    Entries younger than `ttl` seconds are served from disk, older ones are
+    revalidated with If-None-Match / If-Modified-Since. With `offline=True`
+    the network is never touched and a cache miss raises LookupError."""
+    ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+    CACHE_DIR = os.path.join(ROOT_DIR, "data", "cache", "http")
+
+    def __init__(self, cache_dir: str = None, ttl: float = 0, offline: bool = False, **kwargs):
+        super().__init__(**kwargs)
+        self.cache_dir = cache_dir or self.CACHE_DIR
+        self.ttl = ttl
+        self.offline = offline
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def _entry_path(self, url: str) -> str:
+        return os.path.join(self.cache_dir, hashlib.sha256(url.encode("utf-8")).hexdigest() + ".json")
+
+    def _load(self, url: str) -> dict | None:
+        try:
+            with open(self._entry_path(url), "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return entry if entry.get("url") == url else None
+
+    def _save(self, entry: dict) -> None:
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(entry, f, ensure_ascii=False)
+            os.replace(tmp_path, self._entry_path(entry["url"]))
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
     def fetch(self, topic: Topic) -> str:
-        page = requests.get(topic.url, headers=self.headers, allow_redirects=True)
+        url = topic.url
+        entry = self._load(url)
+
+        if self.offline:
+            if entry is None:
+                raise LookupError(f"No cached response for {url} (offline mode)")
+            self.hits += 1
+            return entry["body"]
+
+        if entry is not None and time.time() - entry["fetched_at"] < self.ttl:
+            self.hits += 1
+            return entry["body"]
+
+        headers = {}
+        if entry is not None:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+
+        page = self._get(url, headers=headers)
+        if page.status_code == 304 and entry is not None:
+            self.revalidated += 1
+            entry["fetched_at"] = time.time()
+            self._save(entry)
+            return entry["body"]
+
+        self.misses += 1
+        page.raise_for_status()
+        self._save({
+            "url": url,
+            "etag": page.headers.get("ETag"),
+            "last_modified": page.headers.get("Last-Modified"),
+            "fetched_at": time.time(),
+            "body": page.text
+        })
         return page.text
 
 class PageParser(IParser):
@@ -63,6 +201,51 @@ class PageParser(IParser):
 
         return words
 
+class StreamingPageParser(IParser):
+    """Incremental equivalent of PageParser: feeds the markup to an lxml pull
+    parser in chunks and stops as soon as MAX_WORDS terms have been collected."""
+    MAX_WORDS = 100
+    CHUNK_SIZE = 16 * 1024
+
+    def parse(self, html: str) -> list[str]:
+        parser = etree.HTMLPullParser(events=("start", "end"))
+        words = []
+        term_depth = 0
+        anchor_depth = 0
+
+        for event, element in self._events(parser, html):
+            is_term = element.tag == "span" and "term" in element.get("class", "").split()
+            is_anchor = element.tag == "a" and term_depth > 0
+
+            if event == "start":
+                term_depth += is_term
+                anchor_depth += is_anchor
+                continue
+
+            if is_anchor:
+                anchor_depth -= 1
+                # Strip each fragment before joining, as BeautifulSoup's get_text(strip=True) does.
+                text = "".join(fragment.strip() for fragment in element.itertext())
+                if text and len(text.split()) == 1:
+                    words.append(text)
+                    if len(words) >= self.MAX_WORDS:
+                        return words
+            term_depth -= is_term
+
+            # Drop finished subtrees unless an enclosing anchor still needs their text.
+            if anchor_depth == 0:
+                element.clear(keep_tail=True)
+
+        return words
+
+    def _events(self, parser: etree.HTMLPullParser, html: str):
+        for offset in range(0, len(html), self.CHUNK_SIZE):
+            parser.feed(html[offset:offset + self.CHUNK_SIZE])
+            yield from parser.read_events()
+        # Closing the parser ends any elements left open by unterminated trailing markup.
+        parser.close()
+        yield from parser.read_events()
+
 class TextProcessor(IProcessor):
     def process(self, words: list[str]) -> list[str]:
         return sorted(set(w.lower() for w in words))
@@ -82,16 +265,70 @@ class TextStorage(IStorage):
         with open(path, mode, encoding="utf-8") as scrapped_file:
             scrapped_file.write(f"Topic: {topic.title}\n{words}\n\n")
 
+def iter_jsonl_records(path: str):
+    """Stream records from a JSONL store, skipping a torn final line left by a crash."""
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if not line.endswith("\n"):
+                break
+            if line.strip():
+                yield json.loads(line)
+
+class JsonlStorage(IStorage):
+    """Append-only store with one JSON record per topic. Each record is written
+    with a single write and fsynced, so a crash can at most leave a partial last
+    line, which readers ignore and a resumed run truncates."""
+    ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+    DATA_DIR = os.path.join(ROOT_DIR, "data")
+    FILE_NAME = "scrapped.jsonl"
+
+    def __init__(self, path: str = None, resume: bool = False):
+        self.path = path or os.path.join(self.DATA_DIR, self.FILE_NAME)
+        self.resume = resume
+        self._file_initialized = False
+
+    def _initialize_file(self) -> None:
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        if self.resume and os.path.exists(self.path):
+            valid_size = 0
+            with open(self.path, "rb") as f:
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        break
+                    valid_size += len(line)
+            with open(self.path, "r+b") as f:
+                f.truncate(valid_size)
+        else:
+            open(self.path, "w", encoding="utf-8").close()
+        self._file_initialized = True
+
+    def store(self, topic: Topic, words: list[str]) -> None:
+        if not self._file_initialized:
+            self._initialize_file()
+
+        record = json.dumps({"topic": topic.title, "url": topic.url, "words": words}, ensure_ascii=False)
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(record + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def load_completed(self) -> dict[str, list[str]]:
+        if not self.resume or not os.path.exists(self.path):
+            return {}
+        return {record["topic"]: record["words"] for record in iter_jsonl_records(self.path)}
+
 class Scraper:
     def __init__(self, topics: list[Topic],  fetcher: IFetcher,
                  parser: IParser,
                  processor: IProcessor,
-                 storage: IStorage):
+                 storage: IStorage,
+                 max_workers: int = 1):
         self.topics = TopicsInput(topics)
         self.fetcher = fetcher
         self.parser = parser
         self.processor = processor
         self.storage = storage
+        self.max_workers = max(1, max_workers)
         self._output: list[TopicOutput] = []
 
     @property
@@ -103,14 +340,33 @@ class Scraper:
             raise TypeError("All items in output must be type of TopicOutput!")
         self._output = value
 
+    def _scrape(self, topic: Topic) -> list[str]:
+        html = self.fetcher.fetch(topic)
+        words = self.parser.parse(html)
+        return self.processor.process(words)
+
     def run(self):
+        completed = self.storage.load_completed()
+        pending = [t for t in self.topics if t.title not in completed]
+
+        if self.max_workers == 1:
+            self._collect(completed, map(self._scrape, pending))
+        else:
+            # executor.map yields in submission order, so storage and output
+            # keep the topic order regardless of which fetch finishes first.
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                self._collect(completed, executor.map(self._scrape, pending))
+        return self._output
+
+    def _collect(self, completed: dict[str, list[str]], results) -> None:
+        results = iter(results)
         for t in self.topics:
-            html = self.fetcher.fetch(t)
-            words = self.parser.parse(html)
-            processed_words = self.processor.process(words)
-            self.storage.store(t, processed_words)
+            if t.title in completed:
+                processed_words = completed[t.title]
+            else:
+                processed_words = next(results)
+                self.storage.store(t, processed_words)
             self.output.append(TopicOutput(topic=t.title, words=processed_words))
-        return self._output
 
 if __name__ == "__main__":
     with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), "../config.json")) as f:
@@ -121,5 +377,18 @@ if __name__ == "__main__":
     except KeyError:
         raise KeyError("Missing 'topics' key in config.json")
 
-    scraper = Scraper(config_topics, fetcher=PageFetcher(), parser=PageParser(), processor=TextProcessor(), storage=TextStorage())
+    scraper_config = data.get("scraper", {})
+    cache_config = scraper_config.get("cache", {})
+    fetcher = CachedPageFetcher(
+        ttl=cache_config.get("ttl", 0),
+        offline=cache_config.get("offline", False),
+        pool_size=scraper_config.get("max_workers", 1),
+        rate_limiter=HostRateLimiter(
+            max_concurrent=scraper_config.get("per_host_concurrency", 2),
+            min_interval=scraper_config.get("per_host_delay", 0.0)
+        )
+    )
+    scraper = Scraper(config_topics, fetcher=fetcher, parser=StreamingPageParser(), processor=TextProcessor(),
+                      storage=JsonlStorage(resume=scraper_config.get("resume", False)),
+                      max_workers=scraper_config.get("max_workers", 1))
     scraper.run()
\ No newline at end of file
@@ -1,37 +1,255 @@
+import argparse
+import ast
 import json
+import math
+import sqlite3
+import threading
+import time
 import requests
-from typing import List, Dict, Any
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import List, Dict, Any, Callable, Iterable, Iterator, Optional
 import re
 import uuid
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
 from dotenv import load_dotenv
 import os
+from .scraper import iter_jsonl_records
+
+class TranslationCache:
+    """Persistent translation memory in SQLite, keyed by (word, source, target).
+
+    Each thread gets its own connection and the database runs in WAL mode, so
+    concurrent readers never block on a writer."""
+    QUERY_CHUNK = 500
+
+    def __init__(self, path: str):
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._local = threading.local()
+        self._stats_lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        conn = self._connection()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS translations ("
+            "word TEXT NOT NULL, source TEXT NOT NULL, target TEXT NOT NULL, translation TEXT NOT NULL, "
+            "PRIMARY KEY (word, source, target))"
+        )
+        conn.commit()
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            self._local.conn = conn
+        return conn
+
+    def get_many(self, words: List[str], source: str, target: str) -> Dict[str, str]:
+        conn = self._connection()
+        found = {}
+        for i in range(0, len(words), self.QUERY_CHUNK):
+            chunk = words[i:i + self.QUERY_CHUNK]
+            placeholders = ",".join("?" * len(chunk))
+            rows = conn.execute(
+                f"SELECT word, translation FROM translations "
+                f"WHERE source = ? AND target = ? AND word IN ({placeholders})",
+                [source, target, *chunk]
+            )
+            found.update(rows)
+
+        with self._stats_lock:
+            self.hits += len(found)
+            self.misses += len(set(words)) - len(found)
+        return found
+
+    def put_many(self, source: str, target: str, translations: Dict[str, str]) -> None:
+        conn = self._connection()
+        with conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO translations (word, source, target, translation) VALUES (?, ?, ?, ?)",
+                [(word, source, target, text) for word, text in translations.items()]
+            )
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0
+        }
+
+class TokenBucket:
+    """Character budget refilled at `rate_per_minute`, shared by all in-flight requests.
+
+    A 429 pauses every caller for the Retry-After interval and halves the refill
+    rate; each successful request then wins back a slice of the configured rate."""
+    def __init__(self, rate_per_minute: float, capacity: float = None):
+        self.base_rate = rate_per_minute / 60.0
+        self.rate = self.base_rate
+        self.capacity = capacity or rate_per_minute
+        self.tokens = self.capacity
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, amount: float) -> None:
+        amount = min(amount, self.capacity)
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if now < self._paused_until:
+                    wait = self._paused_until - now
+                elif self.tokens >= amount:
+                    self.tokens -= amount
+                    return
+                else:
+                    wait = (amount - self.tokens) / self.rate
+            time.sleep(wait)
+
+    def throttle(self, retry_after: float) -> None:
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self._paused_until = max(self._paused_until, now + retry_after)
+            self.rate = max(self.base_rate / 16, self.rate / 2)
+            self.tokens = 0.0
+
+    def recover(self) -> None:
+        with self._lock:
+            self._refill(time.monotonic())
+            self.rate = min(self.base_rate, self.rate + self.base_rate / 10)
+
+def parse_retry_after(value: Optional[str], default: float = 1.0) -> float:
+    """Seconds to wait from a Retry-After header, given as seconds or as an HTTP date."""
+    if value is None:
+        return default
+    try:
+        seconds = float(value)
+    except ValueError:
+        try:
+            retry_at = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return default
+        if retry_at.tzinfo is None:
+            retry_at = retry_at.replace(tzinfo=timezone.utc)
+        seconds = (retry_at - datetime.now(timezone.utc)).total_seconds()
+    return max(0.0, seconds) if math.isfinite(seconds) else default
+
+class TranslationCheckpoint:
+    """Side file of translated topics, one fsynced JSON line per topic, so an
+    interrupted run can pick up where it stopped."""
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def load(self) -> List[Dict[str, Any]]:
+        if not os.path.exists(self.path):
+            return []
+        return list(iter_jsonl_records(self.path))
+
+    def append(self, topic: Dict[str, Any]) -> None:
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(topic, ensure_ascii=False) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+
+    def clear(self) -> None:
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+class FailedTranslationLog:
+    """Dead-letter file of (word, source, target, error) records for translations that failed."""
+    def __init__(self, path: str):
+        self.path = path
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def record(self, words: List[str], source: str, target: str, error: str) -> None:
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                for word in words:
+                    f.write(json.dumps({"word": word, "source": source, "target": target, "error": error},
+                                       ensure_ascii=False) + "\n")
+            self.count += len(words)
+
+    def load(self) -> List[Dict[str, str]]:
+        if not os.path.exists(self.path):
+            return []
+        return list(iter_jsonl_records(self.path))
+
+    def clear(self) -> None:
+        with self._lock:
+            if os.path.exists(self.path):
+                os.remove(self.path)
+            self.count = 0
 
 class WordTranslator:
+    # Service limits for a single /translate request.
+    MAX_BATCH_TEXTS = 1000
+    MAX_BATCH_CHARS = 50000
 
-    def __init__(self):
+    def __init__(self, settings: Dict[str, Any] = None):
         base_dir = os.path.dirname(__file__)
         env_path = os.path.join(base_dir, "../.env.local")
         config_path = os.path.join(base_dir, "../config.json")
 
         load_dotenv(env_path)
+        # Explicit settings override the "translator" section of config.json.
+        settings = {**self._read_translator_settings(config_path), **(settings or {})}
+
         self.source_language = "en"
         self.api_key = os.getenv("TRANSLATE_API_KEY")
-        self.endpoint = "https://api.cognitive.microsofttranslator.com/translate"
+        self.endpoint = (settings.get("endpoint") or os.getenv("TRANSLATE_ENDPOINT")
+                         or "https://api.cognitive.microsofttranslator.com/translate")
         self.location = os.getenv("TRANSLATE_LOCATION")
         self.constructed_url = self.endpoint
         self.target_languages = self._read_languages_from_config(config_path)
 
+        self.mode = settings.get("mode", "batched")
+        self.max_batch_texts = min(settings.get("max_batch_texts", self.MAX_BATCH_TEXTS), self.MAX_BATCH_TEXTS)
+        self.max_batch_chars = min(settings.get("max_batch_chars", self.MAX_BATCH_CHARS), self.MAX_BATCH_CHARS)
+
+        cache_path = settings.get("cache_path", "data/translation_cache.sqlite3")
+        self.cache = TranslationCache(os.path.join(base_dir, "../..", cache_path)) if cache_path else None
+
+        self.update_existing = settings.get("update_existing", False)
+        self.failure_log: FailedTranslationLog = None
+        self.max_in_flight = max(1, settings.get("max_in_flight", 4))
+        self.max_throttle_retries = settings.get("max_throttle_retries", 5)
+        self.rate_limiter = TokenBucket(settings.get("chars_per_minute", 33300))
+        if self.mode == "concurrent":
+            # A batch larger than the bucket would be sent on a partial budget and
+            # throttled every time, so no batch may exceed one minute's quota.
+            self.max_batch_chars = min(self.max_batch_chars, int(self.rate_limiter.capacity))
+        self.api_calls = 0
+        self._api_calls_lock = threading.Lock()
+
         # Configure retry strategy
         from requests.adapters import HTTPAdapter
         from urllib3.util.retry import Retry
         
+        # In concurrent mode 429s are handled by the shared token bucket instead,
+        # so one throttled request slows every worker rather than sleeping alone.
+        status_forcelist = [429, 500, 502, 503, 504]
+        if self.mode == "concurrent":
+            status_forcelist.remove(429)
+
         retry_strategy = Retry(
             total=3,
             backoff_factor=1,
-            status_forcelist=[429, 500, 502, 503, 504],
+            status_forcelist=status_forcelist,
             allowed_methods=["HEAD", "GET", "OPTIONS", "POST"]
         )
-        adapter = HTTPAdapter(max_retries=retry_strategy)
+        adapter = HTTPAdapter(max_retries=retry_strategy, pool_maxsize=self.max_in_flight)
         self.session = requests.Session()
         self.session.mount("https://", adapter)
         self.session.mount("http://", adapter)
@@ -45,12 +263,26 @@ class WordTranslator:
             print(f"Error reading config file: {e}. Using default languages.")
             return ["es", "fr", "pl"]
 
-    def read_input_data(self, input_file: str) -> List[Dict[str, Any]]:
-        if input_file.endswith('.txt'):
+    def _read_translator_settings(self, config_file: str) -> Dict[str, Any]:
+        try:
+            with open(config_file, "r", encoding="utf-8") as f:
+                return json.load(f).get("translator", {})
+        except Exception as e:
+            print(f"Error reading config file: {e}. Using default translator settings.")
+            return {}
+
+    def read_input_data(self, input_file: str) -> Iterable[Dict[str, Any]]:
+        if input_file.endswith('.jsonl'):
+            return self._read_jsonl_format(input_file)
+        elif input_file.endswith('.txt'):
             return self._read_txt_format(input_file)
         else:
             return self._read_json_format(input_file)
 
+    def _read_jsonl_format(self, input_file: str) -> Iterator[Dict[str, Any]]:
+        for record in iter_jsonl_records(input_file):
+            yield {"topic": record["topic"], "words": record["words"]}
+
     def _read_json_format(self, input_file: str) -> List[Dict[str, Any]]:
         with open(input_file, "r", encoding="utf-8") as f:
             return json.load(f)
@@ -77,7 +309,7 @@ class WordTranslator:
             words_str = lines[1].strip()
 
             try:
-                words = eval(words_str)
+                words = ast.literal_eval(words_str)
                 if isinstance(words, list):
                     topics.append({
                         "topic": topic_name,
@@ -89,37 +321,237 @@ class WordTranslator:
 
         return topics
 
-    def translate_word(self, word: str, source: str, target: str) -> str:
+    def _headers(self) -> Dict[str, str]:
+        return {
+            'Ocp-Apim-Subscription-Key': self.api_key,
+            'Ocp-Apim-Subscription-Region': self.location,
+            'Content-type': 'application/json',
+            'X-ClientTraceId': str(uuid.uuid4())
+        }
+
+    def _record_failure(self, words: List[str], source: str, target: str, error: str) -> None:
+        if self.failure_log:
+            self.failure_log.record(words, source, target, error)
+
+    def _post(self, params, headers: Dict[str, str], body: Any) -> requests.Response:
+        with self._api_calls_lock:
+            self.api_calls += 1
+        return self.session.post(self.constructed_url, params=params, headers=headers, json=body)
+
+    def translate_word(self, word: str, source: str, target: str) -> Optional[str]:
         params = {
             'api-version': '3.0',
             'from': source,
             'to': target
         }
 
-        headers = {
-            'Ocp-Apim-Subscription-Key': self.api_key,
-            'Ocp-Apim-Subscription-Region': self.location,
-            'Content-type': 'application/json',
-            'X-ClientTraceId': str(uuid.uuid4())
-        }
+        if self.cache:
+            cached = self.cache.get_many([word], source, target)
+            if word in cached:
+                return cached[word]
+
+        headers = self._headers()
 
         body = [{
             'text': word
         }]
 
         try:
-            response = self.session.post(self.constructed_url, params=params, headers=headers, json=body)
+            response = self._post(params, headers, body)
             response.raise_for_status()
 
             result = response.json()
             if result and len(result) > 0 and 'translations' in result[0]:
-                return result[0]['translations'][0]['text']
-            return word
+                translation = result[0]['translations'][0]['text']
+                if self.cache:
+                    self.cache.put_many(source, target, {word: translation})
+                return translation
+            self._record_failure([word], source, target, "no translation in response")
+            return None
         except Exception as e:
             print(f"Error translating '{word}' to {target}: {e}")
-            return word
+            self._record_failure([word], source, target, str(e))
+            return None
+
+    def make_batches(self, words: List[str], target_count: int) -> List[List[str]]:
+        # The character limit applies to the text once per target language.
+        batches = []
+        current, current_chars = [], 0
+        for word in words:
+            word_chars = len(word) * target_count
+            if current and (len(current) >= self.max_batch_texts
+                            or current_chars + word_chars > self.max_batch_chars):
+                batches.append(current)
+                current, current_chars = [], 0
+            current.append(word)
+            current_chars += word_chars
+        if current:
+            batches.append(current)
+        return batches
+
+    def translate_batch(self, words: List[str], source: str, targets: List[str]) -> Dict[str, Dict[str, str]]:
+        """Translate a batch in one request; words missing from the response are left out."""
+        params = [('api-version', '3.0'), ('from', source)] + [('to', target) for target in targets]
+        body = [{'text': word} for word in words]
+
+        response = self._post(params, self._headers(), body)
+        response.raise_for_status()
+
+        translations = {target: {} for target in targets}
+        for word, item in zip(words, response.json()):
+            for translation in item.get('translations', []):
+                if translation.get('to') in translations:
+                    translations[translation['to']][word] = translation['text']
+        return translations
+
+    def _group_uncached(self, words: List[str], resolved: Dict[str, Dict[str, str]]) -> Dict[tuple, List[str]]:
+        """Group words by the target languages they still need, filling `resolved` from the cache."""
+        missing_targets = {word: [] for word in words}
+        for target in self.target_languages:
+            unknown = [word for word in words if word not in resolved[target]]
+            cached = self.cache.get_many(unknown, self.source_language, target) if self.cache and unknown else {}
+            resolved[target].update(cached)
+            for word in unknown:
+                if word not in cached:
+                    missing_targets[word].append(target)
+
+        groups: Dict[tuple, List[str]] = {}
+        for word, targets in missing_targets.items():
+            if targets:
+                groups.setdefault(tuple(targets), []).append(word)
+        return groups
+
+    def _translate_batch_throttled(self, words: List[str], targets: List[str]) -> Dict[str, Dict[str, str]]:
+        chars = sum(len(word) for word in words) * len(targets)
+        for _ in range(self.max_throttle_retries + 1):
+            self.rate_limiter.acquire(chars)
+            try:
+                result = self.translate_batch(words, self.source_language, targets)
+            except requests.HTTPError as e:
+                if e.response is None or e.response.status_code != 429:
+                    raise
+                self.rate_limiter.throttle(parse_retry_after(e.response.headers.get("Retry-After")))
+                continue
+            self.rate_limiter.recover()
+            return result
+        raise RuntimeError(f"still throttled after {self.max_throttle_retries} retries")
+
+    def _translate_group(self, batch: List[str], targets: List[str]) -> Dict[str, Dict[str, Optional[str]]]:
+        error = "no translation in response"
+        try:
+            if self.mode == "concurrent":
+                batch_result = self._translate_batch_throttled(batch, targets)
+            else:
+                batch_result = self.translate_batch(batch, self.source_language, targets)
+        except Exception as e:
+            print(f"Error translating batch of {len(batch)} words to {', '.join(targets)}: {e}")
+            batch_result = {}
+            error = str(e)
+
+        resolved = {}
+        for target in targets:
+            translated = batch_result.get(target, {})
+            if self.cache and translated:
+                self.cache.put_many(self.source_language, target, translated)
+            # Failed words stay None so analysis skips them instead of treating
+            # the source word as a perfect cognate; they go to the dead-letter file.
+            failed = [word for word in batch if word not in translated]
+            if failed:
+                self._record_failure(failed, self.source_language, target, error)
+            resolved[target] = {word: translated.get(word) for word in batch}
+        return resolved
+
+    def _plan_jobs(self, words: List[str], resolved: Dict[str, Dict[str, str]]) -> List[tuple]:
+        """Batches covering every (word, target) pair that is neither in `resolved` nor in the cache."""
+        return [
+            (batch, list(targets))
+            for targets, group in self._group_uncached(words, resolved).items()
+            for batch in self.make_batches(group, len(targets))
+        ]
+
+    def _run_jobs(self, jobs: List[tuple]) -> Iterator[Dict[str, Dict[str, str]]]:
+        """Yield each batch result as soon as it lands."""
+        if self.mode == "concurrent":
+            with ThreadPoolExecutor(max_workers=self.max_in_flight) as executor:
+                futures = [executor.submit(self._translate_group, *job) for job in jobs]
+                for future in as_completed(futures):
+                    yield future.result()
+        else:
+            for job in jobs:
+                yield self._translate_group(*job)
+
+    def translate_words(self, words: List[str]) -> Dict[str, Dict[str, str]]:
+        resolved = {target: {} for target in self.target_languages}
+        for result in self._run_jobs(self._plan_jobs(words, resolved)):
+            for target, translated in result.items():
+                resolved[target].update(translated)
+        return resolved
+
+    def _build_topic(self, topic: Dict[str, Any], resolved: Dict[str, Dict[str, str]]) -> Dict[str, Any]:
+        return {
+            "topic": topic['topic'],
+            "words": [
+                {self.source_language: word,
+                 **{target: resolved[target][word] for target in self.target_languages}}
+                for word in topic['words']
+            ]
+        }
 
-    def translate_topics(self, topics: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def translate_topics(self, topics: Iterable[Dict[str, Any]], known: Dict[str, Dict[str, str]] = None,
+                         on_topic: Callable[[Dict[str, Any]], None] = None) -> List[Dict[str, Any]]:
+        """Translate topics, reusing `known` translations (target -> word -> text).
+
+        `on_topic` is called with each translated topic as soon as all of its
+        words are resolved, which is what checkpointing hooks into.
+        """
+        if self.mode == "serial":
+            return self._translate_topics_serial(topics, known or {}, on_topic)
+
+        topics = list(topics)
+        resolved = {target: dict((known or {}).get(target, {})) for target in self.target_languages}
+        unique_words = list(dict.fromkeys(word for topic in topics for word in topic['words']))
+
+        # Count unresolved (word, target) pairs per topic so each topic can be
+        # emitted the moment its last batch comes back.
+        topic_words = [set(topic['words']) for topic in topics]
+        owners: Dict[str, List[int]] = {}
+        for i, words in enumerate(topic_words):
+            for word in words:
+                owners.setdefault(word, []).append(i)
+
+        translated: Dict[int, Dict[str, Any]] = {}
+
+        def emit(i: int) -> None:
+            translated[i] = self._build_topic(topics[i], resolved)
+            if on_topic:
+                on_topic(translated[i])
+
+        print(f"\nTranslating {len(unique_words)} unique words ({self.mode})...")
+        jobs = self._plan_jobs(unique_words, resolved)
+
+        remaining = [
+            sum(1 for word in words for target in self.target_languages if word not in resolved[target])
+            for words in topic_words
+        ]
+        for i, count in enumerate(remaining):
+            if count == 0:
+                emit(i)
+
+        for result in self._run_jobs(jobs):
+            for target, batch in result.items():
+                for word, text in batch.items():
+                    if word in resolved[target]:
+                        continue
+                    resolved[target][word] = text
+                    for i in owners.get(word, []):
+                        remaining[i] -= 1
+                        if remaining[i] == 0:
+                            emit(i)
+
+        return [translated[i] for i in range(len(topics))]
+
+    def _translate_topics_serial(self, topics: Iterable[Dict[str, Any]], known: Dict[str, Dict[str, str]],
+                                 on_topic: Callable[[Dict[str, Any]], None] = None) -> List[Dict[str, Any]]:
         translated_topics = []
 
         for topic in topics:
@@ -130,7 +562,9 @@ class WordTranslator:
 
                 word_translations = {self.source_language: word}
                 for target_lang in self.target_languages:
-                    translation = self.translate_word(word, self.source_language, target_lang)
+                    translation = known.get(target_lang, {}).get(word)
+                    if translation is None:
+                        translation = self.translate_word(word, self.source_language, target_lang)
                     word_translations[target_lang] = translation
 
                 translated_words.append(word_translations)
@@ -139,16 +573,40 @@ class WordTranslator:
                 "topic": topic['topic'],
                 "words": translated_words
             })
+            if on_topic:
+                on_topic(translated_topics[-1])
 
         return translated_topics
 
+    def _known_translations(self, translated_topics: Iterable[Dict[str, Any]]) -> Dict[str, Dict[str, str]]:
+        known = {target: {} for target in self.target_languages}
+        for topic in translated_topics:
+            for entry in topic['words']:
+                word = entry.get(self.source_language)
+                for target in self.target_languages:
+                    if word is not None and entry.get(target) is not None:
+                        known[target][word] = entry[target]
+        return known
+
     def save_output(self, data: Dict[str, Any], output_file: str):
-        with open(output_file, "w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        content = json.dumps(data, ensure_ascii=False, indent=2)
+        if os.path.exists(output_file):
+            with open(output_file, "r", encoding="utf-8") as f:
+                if f.read() == content:
+                    # Leave the file and its mtime alone so downstream stages stay up to date.
+                    print(f"\n✓ Translation complete! {output_file} is unchanged.")
+                    return
+
+        tmp_file = output_file + ".tmp"
+        with open(tmp_file, "w", encoding="utf-8") as f:
+            f.write(content)
+        os.replace(tmp_file, output_file)
         print(f"\n✓ Translation complete! Output saved to: {output_file}")
 
-    def process(self, output_file: str, input_file: str = None, input_data: List[Dict[str, Any]] = None):
-        if os.path.exists(output_file):
+    def process(self, output_file: str, input_file: str = None, input_data: List[Dict[str, Any]] = None,
+                update: bool = None):
+        update = self.update_existing if update is None else update
+        if os.path.exists(output_file) and not update:
             print(f"Output file '{output_file}' already exists. Skipping translation to save API tokens.")
             return
 
@@ -161,16 +619,102 @@ class WordTranslator:
         else:
             raise ValueError("Either input_file or input_data must be provided.")
 
+        previous = []
+        if os.path.exists(output_file):
+            print(f"Updating '{output_file}': only missing topics and languages will be translated.")
+            previous.extend(self._read_json_format(output_file))
+
+        # Failures still missing after this run are re-recorded below.
+        self.failure_log = FailedTranslationLog(output_file + ".failed.jsonl")
+        self.failure_log.clear()
+
+        checkpoint = TranslationCheckpoint(output_file + ".partial.jsonl")
+        completed = checkpoint.load()
+        if completed:
+            print(f"Resuming from checkpoint: {len(completed)} topics already translated.")
+            previous.extend(completed)
+
         print(f"\nTranslating words to: {', '.join(self.target_languages)}")
-        translated_topics = self.translate_topics(topics)
+        translated_topics = self.translate_topics(
+            topics,
+            known=self._known_translations(previous),
+            on_topic=checkpoint.append
+        )
 
         self.save_output(translated_topics, output_file)
+        checkpoint.clear()
+        self._report_failures()
+
+        if self.cache:
+            stats = self.cache.stats()
+            print(f"Translation cache: {stats['hits']} hits, {stats['misses']} misses "
+                  f"(hit rate {stats['hit_rate']:.1%})")
+
+    def _report_failures(self) -> None:
+        if self.failure_log and self.failure_log.count:
+            print(f"{self.failure_log.count} translations failed and were left empty; "
+                  f"see {self.failure_log.path} and rerun with --retry-failed.")
+
+    def retry_failed(self, output_file: str) -> None:
+        """Retranslate only the entries in the dead-letter file and patch them into `output_file`."""
+        self.failure_log = FailedTranslationLog(output_file + ".failed.jsonl")
+        failures = self.failure_log.load()
+        if not failures:
+            print("No failed translations to retry.")
+            return
+
+        self.failure_log.clear()
+        print(f"Retrying {len(failures)} failed translations...")
+
+        pending: Dict[str, List[str]] = {}
+        for failure in failures:
+            targets = pending.setdefault(failure["word"], [])
+            if failure["target"] not in targets:
+                targets.append(failure["target"])
+
+        groups: Dict[tuple, List[str]] = {}
+        for word, targets in pending.items():
+            groups.setdefault(tuple(targets), []).append(word)
+
+        jobs = [(batch, list(targets)) for targets, words in groups.items()
+                for batch in self.make_batches(words, len(targets))]
+        resolved: Dict[str, Dict[str, str]] = {}
+        for result in self._run_jobs(jobs):
+            for target, translated in result.items():
+                resolved.setdefault(target, {}).update(
+                    {word: text for word, text in translated.items() if text is not None})
+
+        translated_topics = self._read_json_format(output_file)
+        patched = 0
+        for topic in translated_topics:
+            for entry in topic["words"]:
+                word = entry.get(self.source_language)
+                for target, translations in resolved.items():
+                    if entry.get(target) is None and word in translations:
+                        entry[target] = translations[word]
+                        patched += 1
+
+        self.save_output(translated_topics, output_file)
+        print(f"Patched {patched} entries.")
+        self._report_failures()
 
 
 if __name__ == "__main__":
+    # Run from app/ as `python -m modules.translator`.
+    data_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "data"))
+    parser = argparse.ArgumentParser(description="Translate scraped topic words.")
+    parser.add_argument("--input_file", default=os.path.join(data_dir, "scrapped.jsonl"))
+    parser.add_argument("--output_file", default=os.path.join(data_dir, "translated.json"))
+    parser.add_argument("--retry-failed", action="store_true",
+                        help="retranslate only the entries recorded in the dead-letter file")
+    args = parser.parse_args()
+
     translator = WordTranslator()
 
-    translator.process(
-        input_file="../../data/scrapped.txt",
-        output_file="../../data/translated.json"
-    )
\ No newline at end of file
+    if args.retry_failed:
+        translator.retry_failed(args.output_file)
+    else:
+        translator.process(
+            input_file=args.input_file,
+            output_file=args.output_file
+        )
\ No newline at end of file
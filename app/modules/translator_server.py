@@ -0,0 +1,152 @@
+import argparse
+import hashlib
+import json
+import random
+import string
+import threading
+import time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlsplit, parse_qs
+
+
+def fake_translation(text: str, target: str) -> str:
+    """Deterministic stand-in translation: swaps roughly a third of the letters,
+    seeded by the text and target, so distances between languages look plausible."""
+    digest = hashlib.sha256(f"{target}:{text}".encode("utf-8")).digest()
+    chars = list(text)
+    for i, ch in enumerate(chars):
+        byte = digest[i % len(digest)]
+        if ch.isalpha() and byte % 3 == 0:
+            chars[i] = string.ascii_lowercase[byte % 26]
+    return "".join(chars)
+
+
+class TranslatorServer:
+    """Local stand-in for the Translator `/translate` endpoint.
+
+    Requests sleep for `latency` (plus up to `jitter`) seconds, then fail with
+    a 429 carrying `retry_after` with probability `throttle_rate`, or with a
+    503 with probability `error_rate`. Requests over `max_texts` texts or
+    `max_chars` characters (counted once per target) get a 400, like the real
+    service.
+    """
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, latency: float = 0.0, jitter: float = 0.0,
+                 throttle_rate: float = 0.0, error_rate: float = 0.0, retry_after: int = 1,
+                 max_texts: int = 1000, max_chars: int = 50000, seed: int = 0):
+        self.latency = latency
+        self.jitter = jitter
+        self.throttle_rate = throttle_rate
+        self.error_rate = error_rate
+        self.retry_after = retry_after
+        self.max_texts = max_texts
+        self.max_chars = max_chars
+        self.requests = 0
+        self.texts = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/translate"
+
+    def reset_counters(self) -> None:
+        with self._lock:
+            self.requests = 0
+            self.texts = 0
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def _reply(self, status: int, payload, headers: dict = None):
+                body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                texts = [item.get("text", "") for item in json.loads(self.rfile.read(length) or b"[]")]
+                targets = parse_qs(urlsplit(self.path).query).get("to", [])
+
+                with server._lock:
+                    server.requests += 1
+                    delay = server.latency + server._random.random() * server.jitter
+                    roll = server._random.random()
+                time.sleep(delay)
+
+                if roll < server.throttle_rate:
+                    self._reply(429, {"error": {"code": 429000, "message": "Too many requests"}},
+                                {"Retry-After": str(server.retry_after)})
+                    return
+                if roll < server.throttle_rate + server.error_rate:
+                    self._reply(503, {"error": {"code": 503000, "message": "Service unavailable"}})
+                    return
+                if not targets or len(texts) > server.max_texts \
+                        or sum(len(text) for text in texts) * len(targets) > server.max_chars:
+                    self._reply(400, {"error": {"code": 400000, "message": "Request exceeds limits"}})
+                    return
+
+                with server._lock:
+                    server.texts += len(texts)
+                self._reply(200, [
+                    {"translations": [{"text": fake_translation(text, target), "to": target} for target in targets]}
+                    for text in texts
+                ])
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self) -> "TranslatorServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a local stand-in for the Translator API.")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--throttle-rate", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--retry-after", type=int, default=1)
+    parser.add_argument("--max-texts", type=int, default=1000)
+    parser.add_argument("--max-chars", type=int, default=50000)
+    args = parser.parse_args()
+
+    server = TranslatorServer(port=args.port, latency=args.latency, jitter=args.jitter,
+                              throttle_rate=args.throttle_rate, error_rate=args.error_rate,
+                              retry_after=args.retry_after, max_texts=args.max_texts, max_chars=args.max_chars)
+    print(f"Stand-in translator listening on {server.url}")
+    try:
+        server._server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server._server.server_close()
+
+
+if __name__ == "__main__":
+    main()
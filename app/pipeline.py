@@ -1,40 +1,112 @@
 import os
 import json
-import threading
-import itertools
-import time
-import sys
-from modules.scraper import Scraper, PageFetcher, PageParser, TextProcessor, TextStorage, Topic
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from dataclasses import dataclass, field
+from typing import Callable, List
+from modules.scraper import Scraper, CachedPageFetcher, StreamingPageParser, TextProcessor, JsonlStorage, Topic, HostRateLimiter
+from modules.corpus import CorpusArchive, RecordingFetcher
 from modules.translator import WordTranslator
+from modules.metrics import MetricsRecorder
+from modules.analysis.common_functions import TranslationDataset
+from modules.analysis.distance_table import DistanceTable
+from modules.analysis.manifest import AnalysisManifest
+from modules.analysis.word_distance_columns import CURRENT_FILE, columns_path
 from modules.analysis.global_proximity import GlobalProximityAnalyzer
 from modules.analysis.topic_analysis import TopicAnalyzer
 from modules.analysis.word_distance import WordDistanceAnalyzer
 from modules.analysis.community_detection import CommunityDetector
 from modules.analysis.outlier_detection import OutlierDetector
 
-class LoadingSpinner:
-    def __init__(self, message="Processing..."):
-        self.message = message
-        self.stop_running = False
-        self.spinner = itertools.cycle(['|', '/', '-', '\\'])
-
-    def spin(self):
-        while not self.stop_running:
-            sys.stdout.write(f"\r{self.message} {next(self.spinner)}")
-            sys.stdout.flush()
-            time.sleep(0.1)
-        sys.stdout.write('\r' + ' ' * (len(self.message) + 2) + '\r')
-        sys.stdout.flush()
-
-    def __enter__(self):
-        self.stop_running = False
-        self.thread = threading.Thread(target=self.spin)
-        self.thread.start()
-        return self
-
-    def __exit__(self, exc_type, exc_val, exc_tb):
-        self.stop_running = True
-        self.thread.join()
+@dataclass
+class Stage:
+    name: str
+    action: Callable[[], None]
+    inputs: List[str] = field(default_factory=list)
+    outputs: List[str] = field(default_factory=list)
+    # Stages whose in-memory results this stage uses.
+    requires: List[str] = field(default_factory=list)
+
+class StageScheduler:
+    """Runs stages as a DAG: a stage depends on whichever stages produce its
+    input files, independent stages run concurrently, and a stage is skipped
+    when all of its outputs are newer than its inputs and nothing upstream reran.
+
+    A stage without outputs only builds something in memory for the stages
+    that require it, so it runs exactly when one of them does."""
+    def __init__(self, stages: List[Stage], max_workers: int = None, force: bool = False):
+        self.stages = {stage.name: stage for stage in stages}
+        self.max_workers = max_workers or len(stages)
+        self.force = force
+
+        producers = {output: stage.name for stage in stages for output in stage.outputs}
+        self.dependencies = {
+            stage.name: {producers[path] for path in stage.inputs if path in producers} | set(stage.requires)
+            for stage in stages
+        }
+
+    def _topological_order(self) -> List[str]:
+        order, visited = [], set()
+
+        def visit(name, path=()):
+            if name in path:
+                raise ValueError(f"Cycle in analysis stages: {' -> '.join(path + (name,))}")
+            if name in visited:
+                return
+            for dependency in sorted(self.dependencies[name]):
+                visit(dependency, path + (name,))
+            visited.add(name)
+            order.append(name)
+
+        for name in self.stages:
+            visit(name)
+        return order
+
+    @staticmethod
+    def _outputs_fresh(stage: Stage) -> bool:
+        if not stage.outputs or not all(os.path.exists(path) for path in stage.outputs):
+            return False
+        newest_input = max((os.path.getmtime(path) for path in stage.inputs if os.path.exists(path)), default=0)
+        return min(os.path.getmtime(path) for path in stage.outputs) >= newest_input
+
+    def plan(self) -> List[str]:
+        """Names of the stages that need to run, in dependency order."""
+        order = self._topological_order()
+        to_run = set()
+        for name in order:
+            if not self.stages[name].outputs:
+                continue
+            upstream_reran = any(dependency in to_run for dependency in self.dependencies[name])
+            if self.force or upstream_reran or not self._outputs_fresh(self.stages[name]):
+                to_run.add(name)
+        for name in reversed(order):
+            if name in to_run:
+                to_run.update(self.stages[name].requires)
+        return [name for name in order if name in to_run]
+
+    def run(self) -> List[str]:
+        to_run = self.plan()
+        for name in self.stages:
+            if name not in to_run:
+                reason = "outputs are up to date" if self.stages[name].outputs else "no stage that requires it runs"
+                print(f"Skipping {name}: {reason}.")
+
+        pending = set(to_run)
+        done = set()
+        running = {}
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while pending or running:
+                for name in sorted(pending):
+                    if all(dependency in done or dependency not in to_run for dependency in self.dependencies[name]):
+                        pending.discard(name)
+                        running[executor.submit(self.stages[name].action)] = name
+
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    name = running.pop(future)
+                    future.result()
+                    done.add(name)
+        return to_run
 
 class Pipeline:
     def __init__(self):
@@ -43,35 +115,79 @@ class Pipeline:
         self.analysis_dir = os.path.join(self.data_dir, "analysis")
         self.config_path = os.path.join(self.base_path, "app", "config.json")
 
-        self.scrapped_file = os.path.join(self.data_dir, "scrapped.txt")
+        self.scrapped_file = os.path.join(self.data_dir, "scrapped.jsonl")
         self.translated_file = os.path.join(self.data_dir, "translated.json")
         self.global_proximity_file = os.path.join(self.analysis_dir, "global_proximity.json")
         self.topic_proximity_file = os.path.join(self.analysis_dir, "topic_proximity.json")
         self.word_distance_file = os.path.join(self.analysis_dir, "word_distance.json")
+        self.word_distance_columns = os.path.join(columns_path(self.word_distance_file), CURRENT_FILE)
         self.communities_file = os.path.join(self.analysis_dir, "communities.json")
         self.outliers_file = os.path.join(self.analysis_dir, "outliers.json")
+        self.manifest_file = os.path.join(self.analysis_dir, "manifest.json")
+        self.metrics_file = os.path.join(self.data_dir, "metrics.json")
 
         self.scraped_data = None
         self.scraped_data_objects = None
 
+        self._table = None
+        self._manifest = None
+        self._force_analysis = False
+        self._table_metrics = None
+        self.metrics = self._metrics_recorder()
+
+    def load_config(self):
+        with open(self.config_path, "r") as f:
+            return json.load(f)
+
+    def _metrics_recorder(self) -> MetricsRecorder:
+        metrics_config = self.load_config().get("metrics", {})
+        return MetricsRecorder(
+            trace_memory=metrics_config.get("trace_memory", False),
+            profile_dir=os.path.join(self.data_dir, "profiles") if metrics_config.get("profile", False) else None
+        )
+
     def run_scraper(self):
         print("\n=== Step 1: Scraping ===")
         try:
-            with open(self.config_path, "r") as f:
-                config = json.load(f)
+            config = self.load_config()
             
             topics = [Topic(url=item["url"], title=item["title"]) for item in config["topics"]]
+            scraper_config = config.get("scraper", {})
+            cache_config = scraper_config.get("cache", {})
+            max_workers = scraper_config.get("max_workers", 1)
 
-            with LoadingSpinner("Scraping topics..."):
+            with self.metrics.stage("scrape") as stage:
+                cached_fetcher = fetcher = CachedPageFetcher(
+                    ttl=cache_config.get("ttl", 0),
+                    offline=cache_config.get("offline", False),
+                    pool_size=max_workers,
+                    rate_limiter=HostRateLimiter(
+                        max_concurrent=scraper_config.get("per_host_concurrency", 2),
+                        min_interval=scraper_config.get("per_host_delay", 0.0)
+                    )
+                )
+                if scraper_config.get("record_archive"):
+                    archive_path = os.path.join(self.base_path, scraper_config["record_archive"])
+                    fetcher = RecordingFetcher(fetcher, CorpusArchive(archive_path))
                 scraper = Scraper(
                     topics, 
-                    fetcher=PageFetcher(), 
-                    parser=PageParser(), 
+                    fetcher=fetcher, 
+                    parser=StreamingPageParser(), 
                     processor=TextProcessor(), 
-                    storage=TextStorage()
+                    storage=JsonlStorage(self.scrapped_file, resume=scraper_config.get("resume", False)),
+                    max_workers=max_workers
                 )
                 self.scraped_data_objects = scraper.run()
 
+                fetched = cached_fetcher.hits + cached_fetcher.revalidated + cached_fetcher.misses
+                stage.set("topics", len(topics))
+                stage.set("pages_fetched", fetched)
+                stage.set("cache_hits", cached_fetcher.hits)
+                stage.set("cache_revalidated", cached_fetcher.revalidated)
+                stage.set("cache_misses", cached_fetcher.misses)
+                stage.set("cache_hit_rate", round((cached_fetcher.hits + cached_fetcher.revalidated) / fetched, 4)
+                          if fetched else 0.0)
+
             self.scraped_data = [
                 {"topic": item.topic, "words": item.words} 
                 for item in self.scraped_data_objects
@@ -88,49 +204,148 @@ class Pipeline:
             raise ValueError("Scraped data not found. Run scraper first.")
             
         translator = WordTranslator()
-        with LoadingSpinner("Translating words..."):
+        with self.metrics.stage("translate") as stage:
             translator.process(
                 output_file=self.translated_file,
                 input_data=self.scraped_data
             )
+            stage.set("api_calls", translator.api_calls)
+            if translator.cache is not None:
+                cache_stats = translator.cache.stats()
+                stage.set("cache_hits", cache_stats["hits"])
+                stage.set("cache_misses", cache_stats["misses"])
+                stage.set("cache_hit_rate", cache_stats["hit_rate"])
+            if translator.failure_log is not None:
+                stage.set("failed_translations", translator.failure_log.count)
 
-    def run_analysis(self):
-        print("\n=== Step 3: Analysis ===")
+    def _build_distance_table(self):
+        # Shared in memory by the three analyzers that require this stage.
+        with self.metrics.stage("distance_table") as stage:
+            dataset = TranslationDataset.from_file(self.translated_file)
+            self._manifest = AnalysisManifest(self.manifest_file)
+            changed = self._manifest.compare(dataset, force=self._force_analysis)
+            # Only topics that changed since the last run are computed up
+            # front; the analyzers fetch anything else they still need lazily.
+            topics = None if changed is None else [
+                index for index, topic_entry in enumerate(dataset.data) if topic_entry["topic"] in changed
+            ]
+            analysis_config = self.load_config().get("analysis", {})
+            workers = analysis_config.get("workers") or os.cpu_count() or 1
+            if changed is None:
+                print(f"Computing pairwise word distances ({workers} workers)...")
+            else:
+                print(f"Computing pairwise word distances for {len(topics)} changed topics ({workers} workers)...")
+            self._table = DistanceTable(dataset, workers=workers,
+                                        chunk_size=analysis_config.get("chunk_size", 1), topics=topics)
+            stage.set("topics", len(dataset.data))
+            stage.set("topics_computed", len(dataset.data) if topics is None else len(topics))
+        self._table_metrics = stage
 
-        print("Running Global Proximity Analysis...")
-        with LoadingSpinner("Computing global proximity..."):
-            global_analyzer = GlobalProximityAnalyzer(self.translated_file, self.global_proximity_file)
-            global_analyzer.run()
+    def _json_indent(self, indent: int):
+        # Pretty-printing is a large share of the write time and file size of
+        # the bigger outputs, so it can be turned off.
+        return indent if self.load_config().get("analysis", {}).get("pretty_json", True) else None
 
-        print("Running Topic Analysis...")
-        with LoadingSpinner("Computing topic analysis..."):
-            topic_analyzer = TopicAnalyzer(self.translated_file, self.topic_proximity_file)
-            topic_analyzer.run()
+    def _run_global_proximity(self):
+        with self.metrics.stage("global_proximity") as stage:
+            table = self._table
+            analyzer = GlobalProximityAnalyzer(self.translated_file, self.global_proximity_file,
+                                               table.dataset, table, self._manifest, indent=self._json_indent(2))
+            analyzer.run()
+            stage.set("edges_written", len(analyzer.global_data["language"]["edges"]))
 
-        print("Running Word Distance Analysis...")
-        with LoadingSpinner("Computing word distances..."):
-            word_analyzer = WordDistanceAnalyzer(self.translated_file, self.word_distance_file)
-            word_analyzer.run()
+    def _run_topic_analysis(self):
+        with self.metrics.stage("topic_proximity") as stage:
+            table = self._table
+            analyzer = TopicAnalyzer(self.translated_file, self.topic_proximity_file,
+                                     table.dataset, table, self._manifest, indent=self._json_indent(4))
+            analyzer.run()
+            stage.set("topics", len(analyzer.results))
+            stage.set("edges_written", sum(len(graph["edges"]) for graph in analyzer.results.values()))
 
+    def _run_word_distance(self):
+        with self.metrics.stage("word_distance") as stage:
+            table = self._table
+            export_json = self.load_config().get("analysis", {}).get("word_distance_json", True)
+            analyzer = WordDistanceAnalyzer(self.translated_file, self.word_distance_file,
+                                            table.dataset, table, self._manifest, export_json=export_json,
+                                            indent=self._json_indent(2))
+            analyzer.run()
+            stage.set("word_graphs", analyzer.graph_count)
+            stage.set("edges_written", analyzer.edge_count)
 
-        print("Running Community Detection...")
-        with LoadingSpinner("Detecting communities..."):
-            community_detector = CommunityDetector(self.topic_proximity_file, self.communities_file)
-            community_detector.run()
+    def _run_community_detection(self):
+        with self.metrics.stage("community_detection") as stage:
+            analysis_config = self.load_config().get("analysis", {})
+            detector = CommunityDetector(self.topic_proximity_file, self.communities_file,
+                                         backend=analysis_config.get("community_backend", "hierarchical"),
+                                         n_neighbors=analysis_config.get("community_neighbors", 10),
+                                         resolution=analysis_config.get("community_resolution", 0.5))
+            detector.run()
+            stage.set("topics", len(detector.topics))
+            stage.set("communities", len(detector.cluster_analysis))
 
-        print("Running Outlier Detection...")
-        with LoadingSpinner("Detecting outliers..."):
-            outlier_detector = OutlierDetector(
+    def _run_outlier_detection(self):
+        with self.metrics.stage("outlier_detection") as stage:
+            detector = OutlierDetector(
                 word_distances_path=self.word_distance_file,
                 topic_graph_path=self.topic_proximity_file,
-                output_dir=self.analysis_dir
+                output_dir=self.analysis_dir,
+                indent=self._json_indent(2)
             )
-            outlier_detector.run()
+            detector.run()
+            stage.set("word_pairs", detector.word_pair_count)
+            stage.set("outliers", len(detector.outliers))
+
+    def analysis_stages(self) -> List[Stage]:
+        # The JSON copy of the word distances is only an export for the GUI;
+        # downstream stages read the columnar output.
+        word_distance_outputs = [self.word_distance_columns]
+        if self.load_config().get("analysis", {}).get("word_distance_json", True):
+            word_distance_outputs.append(self.word_distance_file)
+
+        return [
+            Stage("distance_table", self._build_distance_table, inputs=[self.translated_file]),
+            Stage("global_proximity", self._run_global_proximity, inputs=[self.translated_file],
+                  outputs=[self.global_proximity_file], requires=["distance_table"]),
+            Stage("topic_proximity", self._run_topic_analysis, inputs=[self.translated_file],
+                  outputs=[self.topic_proximity_file], requires=["distance_table"]),
+            Stage("word_distance", self._run_word_distance, inputs=[self.translated_file],
+                  outputs=word_distance_outputs, requires=["distance_table"]),
+            Stage("community_detection", self._run_community_detection,
+                  inputs=[self.topic_proximity_file], outputs=[self.communities_file]),
+            Stage("outlier_detection", self._run_outlier_detection,
+                  inputs=[self.word_distance_columns, self.topic_proximity_file], outputs=[self.outliers_file]),
+        ]
+
+    def run_analysis(self, force: bool = False):
+        print("\n=== Step 3: Analysis ===")
+
+        self._table = None
+        self._manifest = None
+        self._force_analysis = force
+        self._table_metrics = None
+        scheduler = StageScheduler(self.analysis_stages(), force=force)
+        try:
+            ran = scheduler.run()
+        finally:
+            if self._table is not None and self._table_metrics is not None:
+                # Word pairs compared, including rows the analyzers filled in lazily.
+                self._table_metrics.set("comparisons", self._table.comparisons())
+            self.metrics.save(self.metrics_file)
+        if self._manifest is not None:
+            self._manifest.save()
+        print(f"Analysis stages run: {', '.join(ran) if ran else 'none (all outputs up to date)'}")
 
     def run(self):
-        self.run_scraper()
-        self.run_translator()
-        self.run_analysis()
+        self.metrics = self._metrics_recorder()
+        try:
+            self.run_scraper()
+            self.run_translator()
+            self.run_analysis()
+        finally:
+            self.metrics.save(self.metrics_file)
+            print(f"Metrics saved to {self.metrics_file}")
         print("\n=== Pipeline Completed Successfully ===")
 
 if __name__ == "__main__":
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# The app's modules are imported as top-level packages, as when running from app/.
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
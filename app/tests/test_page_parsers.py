@@ -0,0 +1,26 @@
+import pytest
+from modules.scraper import PageParser, StreamingPageParser
+
+def term(inner: str) -> str:
+    return f'<li><span class="term"><a href="/wiki/x">{inner}</a></span> - gloss</li>'
+
+PAGES = [
+    term("<b>ca</b> <i>t</i>"),
+    term(" dog&nbsp;") + term("&nbsp;&nbsp;"),
+    term("two<br>words") + term("two<br/>  words") + term("two words"),
+    term("\n   bird\n ") + "tail text",
+    term("fi<!-- note -->sh") + term("x<span>y <b> z</b></span>"),
+    '<span class="term">no anchor</span><a>outside</a>' + term("inside"),
+    '<span class="other term"><a>multi</a></span><span class="terms"><a>near</a></span>',
+    '<span class="term"><a>un<em>ter</em>minated',
+    "<ul>" + "".join(term(f"w{i}") for i in range(150)) + "</ul>",
+]
+
+@pytest.mark.parametrize("html", PAGES)
+def test_streaming_parser_matches_page_parser(html):
+    assert StreamingPageParser().parse(html) == PageParser().parse(html)
+
+def test_streaming_parser_across_chunk_boundaries(monkeypatch):
+    monkeypatch.setattr(StreamingPageParser, "CHUNK_SIZE", 7)
+    for html in PAGES:
+        assert StreamingPageParser().parse(html) == PageParser().parse(html)